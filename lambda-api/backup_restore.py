@@ -0,0 +1,200 @@
+"""Backup and restore the hackathon DynamoDB tables.
+
+Backups are one gzip-compressed NDJSON file per table, one item per line in
+DynamoDB JSON (the same item format as the `aws dynamodb scan` exports in
+backups/). Restores write each table with several batch writers in parallel and
+resume from the last checkpoint if interrupted.
+
+    python3 backup_restore.py backup --out ../backups/2026-03-01
+    python3 backup_restore.py restore --in ../backups/2026-03-01 --tables teams scores --writers 8
+    python3 backup_restore.py restore --file ../backups/use-cases-backup-20260206-183724.json --tables use_cases
+
+Add --endpoint-url http://localhost:8000 to run against DynamoDB Local.
+"""
+import argparse
+import gzip
+import json
+import os
+import threading
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+
+TABLES = {
+    'teams': 'aais-hackathon-teams',
+    'panelists': 'aais-hackathon-panelists',
+    'scores': 'aais-hackathon-scores',
+    'use_cases': 'aais-hackathon-use-cases',
+    'judging_criteria': 'aais-hackathon-judging-criteria'
+}
+
+RESTORE_CHUNK_SIZE = 500  # Items per batch_writer task; the checkpoint advances a chunk at a time
+
+def make_session_args(args):
+    """boto3 client/resource arguments shared by every call"""
+    kwargs = {'region_name': args.region}
+    if args.endpoint_url:
+        kwargs['endpoint_url'] = args.endpoint_url
+    return kwargs
+
+def backup_table(short_name, out_dir, segments, session_args):
+    """Parallel-scan one table into <out_dir>/<short_name>.ndjson.gz"""
+    client = boto3.client('dynamodb', **session_args)  # Low-level clients are thread safe
+    path = os.path.join(out_dir, f'{short_name}.ndjson.gz')
+    tmp_path = path + '.tmp'
+    write_lock = threading.Lock()
+    counts = {'items': 0, 'bytes': 0}  # bytes: uncompressed UTF-8 NDJSON
+    started = time.perf_counter()
+
+    def scan_segment(out, segment):
+        params = {'TableName': TABLES[short_name], 'Segment': segment, 'TotalSegments': segments}
+        while True:
+            result = client.scan(**params)
+            lines = ''.join(json.dumps(item) + '\n' for item in result.get('Items', []))
+            with write_lock:
+                out.write(lines)
+                counts['items'] += len(result.get('Items', []))
+                counts['bytes'] += len(lines.encode('utf-8'))
+            if 'LastEvaluatedKey' not in result:
+                return
+            params['ExclusiveStartKey'] = result['LastEvaluatedKey']
+
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as out:
+        with ThreadPoolExecutor(max_workers=segments) as pool:
+            for future in [pool.submit(scan_segment, out, i) for i in range(segments)]:
+                future.result()
+    os.replace(tmp_path, path)
+
+    report(f'Backed up {short_name}', counts, time.perf_counter() - started)
+    return counts
+
+def read_items(path):
+    """Yield DynamoDB JSON items from an NDJSON(.gz) backup or a legacy scan export"""
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            yield from json.load(f).get('Items', [])
+        return
+
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def restore_table(short_name, path, session_args, writers=1):
+    """Write a backup file into its table with parallel batch_writers, checkpointing finished chunks"""
+    deserializer = TypeDeserializer()
+    writer_state = threading.local()
+    progress_path = path + '.progress'
+
+    done = 0
+    if os.path.exists(progress_path):
+        with open(progress_path) as f:
+            done = int(f.read().strip() or 0)
+        print(f'Resuming {short_name} after {done} items')
+    skip = done
+
+    counts = {'items': 0, 'bytes': 0}  # bytes: UTF-8 DynamoDB JSON read from the backup
+    started = time.perf_counter()
+
+    def write_chunk(chunk):
+        # Each writer thread gets its own resource; boto3 resources are not thread safe
+        if not hasattr(writer_state, 'table'):
+            writer_state.table = boto3.session.Session().resource('dynamodb', **session_args).Table(TABLES[short_name])
+        with writer_state.table.batch_writer() as batch:
+            for item in chunk:
+                batch.put_item(Item={key: deserializer.deserialize(value) for key, value in item.items()})
+        return len(chunk)
+
+    # Chunks finish out of order, so the checkpoint only moves over a contiguous run of finished
+    # chunks; a resume rewrites any that finished past it, which is harmless (puts are idempotent)
+    in_flight = {}  # future -> chunk index
+    finished = {}  # chunk index -> item count, finished ahead of the checkpoint
+    next_index = 0
+
+    def collect(return_when):
+        nonlocal done, next_index
+        completed, _ = wait(in_flight, return_when=return_when)
+        for future in completed:
+            finished[in_flight.pop(future)] = future.result()
+        advanced = next_index in finished
+        while next_index in finished:
+            written = finished.pop(next_index)
+            done += written
+            counts['items'] += written
+            next_index += 1
+        if advanced:
+            with open(progress_path, 'w') as f:
+                f.write(str(done))
+
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        chunk = []
+        chunk_index = 0
+        for i, item in enumerate(read_items(path)):
+            if i < skip:
+                continue
+            chunk.append(item)
+            counts['bytes'] += len(json.dumps(item).encode('utf-8'))
+            if len(chunk) >= RESTORE_CHUNK_SIZE:
+                in_flight[pool.submit(write_chunk, chunk)] = chunk_index
+                chunk, chunk_index = [], chunk_index + 1
+                if len(in_flight) >= writers * 2:
+                    collect(FIRST_COMPLETED)  # Bounds the chunks held in memory
+        if chunk:
+            in_flight[pool.submit(write_chunk, chunk)] = chunk_index
+        while in_flight:
+            collect(ALL_COMPLETED)
+
+    if os.path.exists(progress_path):
+        os.remove(progress_path)
+    report(f'Restored {short_name}', counts, time.perf_counter() - started)
+    return counts
+
+def report(label, counts, seconds):
+    """Print item and byte throughput for one table"""
+    seconds = max(seconds, 1e-6)
+    print(f"{label}: {counts['items']} items, {counts['bytes'] / 1024:.1f} KiB in {seconds:.2f}s "
+          f"({counts['items'] / seconds:.0f} items/s, {counts['bytes'] / 1024 / seconds:.1f} KiB/s)")
+
+def run_per_table(func, jobs, workers):
+    """Run one job per table on a bounded pool and print the overall throughput"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = [future.result() for future in [pool.submit(func, *job) for job in jobs]]
+    totals = {key: sum(r[key] for r in results) for key in ('items', 'bytes')}
+    report('Total', totals, time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description='Backup and restore the hackathon DynamoDB tables')
+    parser.add_argument('command', choices=['backup', 'restore'])
+    parser.add_argument('--tables', nargs='+', choices=list(TABLES), default=list(TABLES))
+    parser.add_argument('--out', help='Backup directory to write')
+    parser.add_argument('--in', dest='in_dir', help='Backup directory to restore from')
+    parser.add_argument('--file', help='Restore a single file (NDJSON, NDJSON.gz or a scan export) into --tables')
+    parser.add_argument('--segments', type=int, default=4, help='Parallel scan segments per table')
+    parser.add_argument('--workers', type=int, default=2, help='Tables processed concurrently')
+    parser.add_argument('--writers', type=int, default=4, help='Concurrent batch writers per table when restoring')
+    parser.add_argument('--region', default='us-east-1')
+    parser.add_argument('--endpoint-url', help='e.g. http://localhost:8000 for DynamoDB Local')
+    args = parser.parse_args()
+    session_args = make_session_args(args)
+
+    if args.command == 'backup':
+        out_dir = args.out or os.path.join('..', 'backups', time.strftime('%Y%m%d-%H%M%S'))
+        os.makedirs(out_dir, exist_ok=True)
+        run_per_table(backup_table, [(name, out_dir, args.segments, session_args) for name in args.tables], args.workers)
+        print(f'Backup written to {out_dir}')
+    elif args.file:
+        if len(args.tables) != 1:
+            parser.error('--file needs exactly one table in --tables')
+        restore_table(args.tables[0], args.file, session_args, args.writers)
+    else:
+        if not args.in_dir:
+            parser.error('restore needs --in or --file')
+        jobs = [(name, os.path.join(args.in_dir, f'{name}.ndjson.gz'), session_args, args.writers) for name in args.tables]
+        run_per_table(restore_table, jobs, args.workers)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import boto3
+import time
+
+# Ordered log of team and score writes, read by the API's ?since= delta endpoints
+dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+changes_table = dynamodb.Table('aais-hackathon-changes')
+
+CHANGE_LOG_TTL_SECONDS = 7 * 86400  # Delta cursors older than this must refetch in full
+
+def change_entry(entity, record):
+    """Change log item for one stream record
+
+    change_key starts with the time the entry is logged, not the time of the write, so a record
+    delivered late by stream batching still sorts after cursors handed out before it was visible.
+    """
+    stream_data = record['dynamodb']
+    changed_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(stream_data.get('ApproximateCreationDateTime', time.time())))
+    logged_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    return {
+        'entity': entity,
+        'change_key': f"{logged_at}#{stream_data['SequenceNumber']}",
+        'key': {name: value['S'] for name, value in stream_data['Keys'].items()},  # Primary key of the changed item
+        'op': 'delete' if record.get('eventName') == 'REMOVE' else 'upsert',
+        'changed_at': changed_at,
+        'expires_at': int(time.time()) + CHANGE_LOG_TTL_SECONDS
+    }
+
+def record_changes(entries):
+    """Write change log items; raises so the stream batch is retried on failure"""
+    if not entries:
+        return
+    with changes_table.batch_writer() as batch:
+        for entry in entries:
+            batch.put_item(Item=entry)
+    print(f"Logged {len(entries)} {entries[0]['entity']} changes")
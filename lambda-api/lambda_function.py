@@ -1,47 +1,165 @@
+import time
+IMPORT_STARTED = time.perf_counter()
+
 import json
-import boto3
 import hashlib
 import hmac
 import base64
-import time
+import csv
+import io
 import os
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
-# Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-teams_table = dynamodb.Table('aais-hackathon-teams')
-panelists_table = dynamodb.Table('aais-hackathon-panelists')
-scores_table = dynamodb.Table('aais-hackathon-scores')
-use_cases_table = dynamodb.Table('aais-hackathon-use-cases')
-judging_criteria_table = dynamodb.Table('aais-hackathon-judging-criteria')
+from ranking import RankIndex
+from score_analytics import analyze_scores
+
+try:
+    import orjson  # Optional faster encoder, used when bundled with the deployment
+except ImportError:
+    orjson = None
+
+# AWS clients are built on first use, so a cold start only pays for the ones its route needs
+aws_clients = {}
+aws_clients_lock = threading.Lock()
+client_init_ms = {}
+
+def get_aws(kind, service):
+    """Memoized boto3 resource or client (kind is 'resource' or 'client')"""
+    key = (kind, service)
+    if key not in aws_clients:
+        with aws_clients_lock:
+            if key not in aws_clients:
+                started = time.perf_counter()
+                import boto3
+                aws_clients[key] = getattr(boto3, kind)(service, region_name='us-east-1')
+                client_init_ms[service] = (time.perf_counter() - started) * 1000
+                print(f"Initialized {service} {kind} in {client_init_ms[service]:.1f}ms")
+    return aws_clients[key]
+
+class LazyTable:
+    """DynamoDB Table handle that creates the underlying resource on first use
+    
+    Resource objects are not thread safe, so code that runs on pool threads (fan_out, scan_all)
+    only uses the handle for .name and .meta.client.
+    """
+    
+    lock = threading.Lock()  # First use can come from several pool threads at once
+    
+    def __init__(self, name):
+        self.name = name
+        self.table = None
+    
+    def __getattr__(self, attr):
+        if self.table is None:
+            with LazyTable.lock:
+                if self.table is None:
+                    self.table = get_aws('resource', 'dynamodb').Table(self.name)
+        return getattr(self.table, attr)
 
-# Initialize Bedrock
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
+# DynamoDB tables
+teams_table = LazyTable('aais-hackathon-teams')
+panelists_table = LazyTable('aais-hackathon-panelists')
+scores_table = LazyTable('aais-hackathon-scores')
+use_cases_table = LazyTable('aais-hackathon-use-cases')
+judging_criteria_table = LazyTable('aais-hackathon-judging-criteria')
+leaderboard_table = LazyTable('aais-hackathon-leaderboard')  # Maintained by score_stream_handler
+counters_table = LazyTable('aais-hackathon-counters')
+changes_table = LazyTable('aais-hackathon-changes')  # Written by both stream handlers (change_log.py)
+results_table = LazyTable('aais-hackathon-results')  # Results snapshot frozen at voting lock
 
 # JWT Secret (in production, use AWS Secrets Manager)
 JWT_SECRET = os.environ.get('JWT_SECRET', 'aais-hackathon-2026-secret-key')
 
-def decimal_to_num(obj):
-    """Convert Decimal to int/float for JSON serialization"""
+# Keyed HMAC state computed once; each signature starts from a .copy()
+JWT_HMAC = hmac.new(JWT_SECRET.encode(), digestmod=hashlib.sha256)
+
+# Bounded LRU of verified tokens: token -> decoded payload (keyed on the token string itself;
+# a separate digest would cost more than the HMAC it saves, and 1024 tokens is ~250 KB)
+VERIFIED_TOKEN_CACHE_SIZE = 1024
+verified_tokens = OrderedDict()
+
+# Parallel scan segments for the tables that grow with the event (teams, scores, leaderboard)
+SCAN_SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', '4'))
+
+# Thread pool shared across warm invocations for reads a handler fans out concurrently.
+# Work running on it must not submit back to it (scan_all uses its own per-call pool).
+FANOUT_POOL = ThreadPoolExecutor(max_workers=int(os.environ.get('FANOUT_WORKERS', '8')))
+FANOUT_TIMEOUT_SECONDS = float(os.environ.get('FANOUT_TIMEOUT_SECONDS', '10'))
+
+# Batch reads/writes retry unprocessed keys with exponential backoff, then give up and raise
+BATCH_MAX_ATTEMPTS = 8
+
+# Score transactions all check the one judging criteria item, so concurrent submissions can cancel each
+# other with TransactionConflict; those are retried with jittered backoff this many times in total
+TRANSACT_MAX_ATTEMPTS = 4
+
+# Warm-container cache of panelist display names: panelist_id -> (name, expires_at)
+PANELIST_NAME_TTL_SECONDS = 300
+panelist_name_cache = {}
+
+# Warm-container read-through cache for near-static data: key -> (version, expires_at, value)
+# Admin writes bump the key's version so this container never serves data older than its own writes
+CACHE_TTL_SECONDS = int(os.environ.get('CACHE_TTL_SECONDS', '30'))
+read_cache = {}
+cache_versions = {}
+
+# Cache-Control for the public GET routes; each also gets an ETag so repeat requests revalidate to a 304.
+# Use cases and criteria are read-mostly, so browsers and shared caches keep them briefly (the admin
+# dashboard refetches with cache: 'no-cache' after an edit). The voting lock must show up at once.
+USE_CASES_CACHE_CONTROL = 'public, max-age=15, s-maxage=30'
+CRITERIA_CACHE_CONTROL = 'public, max-age=15, s-maxage=30'
+VOTING_STATUS_CACHE_CONTROL = 'no-cache'
+TEAM_CARD_CACHE_CONTROL = 'public, max-age=60'
+
+# ?since= delta reads start this far behind the cursor. Entries are keyed on the time they are logged,
+# so this only has to cover the change log write itself and clock skew between Lambdas.
+CHANGE_LOG_OVERLAP_SECONDS = int(os.environ.get('CHANGE_LOG_OVERLAP_SECONDS', '30'))
+CHANGE_LOG_RETENTION_SECONDS = 7 * 86400  # change_log TTL; older cursors must refetch in full
+
+def json_default(obj):
+    """Encode the DynamoDB types json can't handle (Decimal numbers, string/number sets)"""
     if isinstance(obj, Decimal):
         return int(obj) if obj % 1 == 0 else float(obj)
-    elif isinstance(obj, dict):
-        return {k: decimal_to_num(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [decimal_to_num(i) for i in obj]
-    return obj
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+json_encoder = json.JSONEncoder(default=json_default)
+
+def to_json(body):
+    """Serialize a payload in a single pass, without copying it first"""
+    if orjson:
+        return orjson.dumps(body, default=json_default).decode()
+    return json_encoder.encode(body)
+
+def jwt_signature(signing_input):
+    """HMAC-SHA256 of the JWT signing input, base64url-encoded without padding"""
+    mac = JWT_HMAC.copy()
+    mac.update(signing_input.encode())
+    return base64.urlsafe_b64encode(mac.digest()).decode().rstrip('=')
 
 def create_jwt(payload):
     """Create a simple JWT token"""
     header = base64.urlsafe_b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}).encode()).decode().rstrip('=')
     payload['exp'] = int(time.time()) + 86400  # 24 hour expiry
     payload_encoded = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
-    signature = hmac.new(JWT_SECRET.encode(), f"{header}.{payload_encoded}".encode(), hashlib.sha256).digest()
-    signature_encoded = base64.urlsafe_b64encode(signature).decode().rstrip('=')
+    signature_encoded = jwt_signature(f"{header}.{payload_encoded}")
     return f"{header}.{payload_encoded}.{signature_encoded}"
 
 def verify_jwt(token):
     """Verify and decode JWT token"""
+    payload = verified_tokens.get(token)
+    if payload is not None:
+        if payload.get('exp', 0) < time.time():
+            verified_tokens.pop(token, None)
+            return None
+        verified_tokens.move_to_end(token)
+        return payload
+    
     try:
         parts = token.split('.')
         if len(parts) != 3:
@@ -49,8 +167,7 @@ def verify_jwt(token):
         header, payload_encoded, signature = parts
         
         # Verify signature
-        expected_sig = hmac.new(JWT_SECRET.encode(), f"{header}.{payload_encoded}".encode(), hashlib.sha256).digest()
-        expected_sig_encoded = base64.urlsafe_b64encode(expected_sig).decode().rstrip('=')
+        expected_sig_encoded = jwt_signature(f"{header}.{payload_encoded}")
         
         if not hmac.compare_digest(signature, expected_sig_encoded):
             return None
@@ -64,7 +181,10 @@ def verify_jwt(token):
         # Check expiry
         if payload.get('exp', 0) < time.time():
             return None
-            
+        
+        verified_tokens[token] = payload
+        if len(verified_tokens) > VERIFIED_TOKEN_CACHE_SIZE:
+            verified_tokens.popitem(last=False)
         return payload
     except Exception as e:
         print(f"JWT verification error: {e}")
@@ -83,19 +203,401 @@ def get_auth_context(event):
 
 def response(status_code, body):
     """Create API Gateway response with CORS headers"""
+    return text_response(status_code, to_json(body), 'application/json')
+
+def text_response(status_code, text, content_type, extra_headers=None):
+    """Create API Gateway response with CORS headers for an already-encoded body"""
     return {
         'statusCode': status_code,
         'headers': {
-            'Content-Type': 'application/json',
+            'Content-Type': content_type,
             'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
+            'Access-Control-Allow-Headers': 'Content-Type,Authorization,If-None-Match',
+            'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+            'Access-Control-Expose-Headers': 'ETag,X-Next-Cursor',
+            **(extra_headers or {})
         },
-        'body': json.dumps(decimal_to_num(body))
+        'body': text
     }
 
+def conditional_response(event, result, cache_control):
+    """Add ETag and Cache-Control to a 200 response, answering 304 when If-None-Match matches"""
+    if result['statusCode'] != 200:
+        return result
+    
+    # Strong validator: digest of the exact body bytes being served
+    etag = '"' + hashlib.sha256(result['body'].encode()).hexdigest()[:32] + '"'
+    result['headers']['ETag'] = etag
+    result['headers']['Cache-Control'] = cache_control
+    
+    headers = event.get('headers', {}) or {}
+    if_none_match = headers.get('If-None-Match') or headers.get('if-none-match', '')
+    candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    if etag in candidates or '*' in candidates:
+        return {'statusCode': 304, 'headers': result['headers'], 'body': ''}
+    
+    return result
+
+def scan_all(table, segments=1, **scan_kwargs):
+    """Scan every page of a table, optionally as a parallel scan across segments"""
+    if segments <= 1:
+        return scan_segment(table, scan_kwargs)
+    
+    # Resource objects are not thread safe, so each segment runs on the shared low-level client
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        futures = [
+            pool.submit(scan_segment, table, {**scan_kwargs, 'Segment': i, 'TotalSegments': segments})
+            for i in range(segments)
+        ]
+        items = []
+        for future in futures:
+            items.extend(future.result())
+    return items
+
+def scan_segment(table, scan_kwargs):
+    """Follow LastEvaluatedKey until a scan (or one scan segment) is exhausted"""
+    client = table.meta.client
+    params = {'TableName': table.name, **scan_kwargs}
+    items = []
+    while True:
+        result = client.scan(**params)
+        items.extend(result.get('Items', []))
+        if 'LastEvaluatedKey' not in result:
+            return items
+        params['ExclusiveStartKey'] = result['LastEvaluatedKey']
+
+def query_all(table, **query_kwargs):
+    """Query every page for a key condition
+    
+    Runs on the low-level client like scan_segment, since fan_out calls it from pool threads.
+    """
+    client = table.meta.client
+    params = {'TableName': table.name, **query_kwargs}
+    items = []
+    while True:
+        result = client.query(**params)
+        items.extend(result.get('Items', []))
+        if 'LastEvaluatedKey' not in result:
+            return items
+        params['ExclusiveStartKey'] = result['LastEvaluatedKey']
+
+def batch_get_items(table, keys, **request_kwargs):
+    """Fetch items by primary key with BatchGetItem, 100 keys per request (thread safe, on the low-level client)"""
+    items = []
+    for i in range(0, len(keys), 100):
+        request_items = {table.name: {'Keys': keys[i:i + 100], **request_kwargs}}
+        attempt = 0
+        while request_items:
+            result = get_aws('resource', 'dynamodb').meta.client.batch_get_item(RequestItems=request_items)
+            items.extend(result.get('Responses', {}).get(table.name, []))
+            request_items = result.get('UnprocessedKeys')
+            if request_items:
+                # Back off before retrying throttled keys
+                attempt += 1
+                if attempt >= BATCH_MAX_ATTEMPTS:
+                    raise RuntimeError(f'BatchGetItem on {table.name} left keys unprocessed after {attempt} attempts')
+                time.sleep(min(0.05 * 2 ** attempt, 1))
+    return items
+
+def batch_delete_items(table, keys):
+    """Delete items by primary key with BatchWriteItem, 25 keys per request"""
+    for i in range(0, len(keys), 25):
+        request_items = {table.name: [{'DeleteRequest': {'Key': key}} for key in keys[i:i + 25]]}
+        attempt = 0
+        while request_items:
+            result = get_aws('resource', 'dynamodb').meta.client.batch_write_item(RequestItems=request_items)
+            request_items = result.get('UnprocessedItems')
+            if request_items:
+                # Back off before retrying throttled deletes
+                attempt += 1
+                if attempt >= BATCH_MAX_ATTEMPTS:
+                    raise RuntimeError(f'BatchWriteItem on {table.name} left deletes unprocessed after {attempt} attempts')
+                time.sleep(min(0.05 * 2 ** attempt, 1))
+    return len(keys)
+
+def next_sequence_value(counter_name):
+    """Atomically allocate the next value of a named counter (shared by any table needing numeric IDs)"""
+    result = counters_table.update_item(
+        Key={'counter_name': counter_name},
+        UpdateExpression='ADD #v :one',
+        ExpressionAttributeNames={'#v': 'value'},
+        ExpressionAttributeValues={':one': 1},
+        ReturnValues='UPDATED_NEW'
+    )
+    return int(result['Attributes']['value'])
+
+def cached(key, loader):
+    """Return a cached value, calling loader() to refresh it when missing or expired"""
+    version = cache_versions.get(key, 0)
+    entry = read_cache.get(key)
+    if entry and entry[0] == version and entry[1] > time.time():
+        print(f"Cache hit: {key}")
+        return entry[2]
+    
+    print(f"Cache miss: {key}")
+    value = loader()
+    # Skip storing if an invalidation happened while loading
+    if cache_versions.get(key, 0) == version:
+        read_cache[key] = (version, time.time() + CACHE_TTL_SECONDS, value)
+    return value
+
+def invalidate_cache(key):
+    """Drop a cached value so the next read goes to DynamoDB"""
+    cache_versions[key] = cache_versions.get(key, 0) + 1
+    read_cache.pop(key, None)
+    print(f"Cache invalidated: {key}")
+
+def load_use_cases():
+    """All use cases, including inactive ones (cached)"""
+    return cached('use_cases', lambda: scan_all(use_cases_table))
+
+def find_use_case(use_case_id):
+    """Look up a single use case from the cached list"""
+    return next((uc for uc in load_use_cases() if uc['use_case_id'] == use_case_id), None)
+
+def load_criteria():
+    """The judging criteria item, which also holds the voting lock (cached; read on the client, as fan_out calls it)"""
+    return cached('criteria', lambda: judging_criteria_table.meta.client.get_item(
+        TableName=judging_criteria_table.name, Key={'criteria_id': 'main'}).get('Item', {}))
+
+# Bookkeeping kept on the criteria item that is never sent to clients
+INTERNAL_CRITERIA_FIELDS = ['results_snapshot_id']
+
+def public_criteria(criteria):
+    """The criteria item without internal fields"""
+    return {key: value for key, value in criteria.items() if key not in INTERNAL_CRITERIA_FIELDS}
+
+def get_panelist_names(panelist_ids):
+    """Resolve panelist display names, batch-fetching any that are not cached"""
+    now = time.time()
+    names = {}
+    missing = []
+    for panelist_id in set(panelist_ids):
+        known = panelist_name_cache.get(panelist_id)
+        if known and known[1] > now:
+            names[panelist_id] = known[0]
+        else:
+            missing.append(panelist_id)
+    
+    if missing:
+        panelists = batch_get_items(
+            panelists_table,
+            [{'panelist_id': panelist_id} for panelist_id in missing],
+            ProjectionExpression='panelist_id, #n',
+            ExpressionAttributeNames={'#n': 'name'}
+        )
+        for panelist in panelists:
+            name = panelist.get('name', panelist['panelist_id'])
+            names[panelist['panelist_id']] = name
+            panelist_name_cache[panelist['panelist_id']] = (name, now + PANELIST_NAME_TTL_SECONDS)
+    
+    return names
+
+def fan_out(calls, timeouts=None):
+    """Run independent zero-argument calls concurrently on FANOUT_POOL
+    
+    Returns ({name: result}, {name: elapsed ms}). Each call has its own deadline from
+    submission (timeouts[name], default FANOUT_TIMEOUT_SECONDS); the first error or
+    overrun is raised. An overrunning call can't be interrupted and finishes in the background.
+    """
+    timeouts = timeouts or {}
+    timings_ms = {}
+    
+    def timed(name, call):
+        started = time.perf_counter()
+        try:
+            return call()
+        finally:
+            timings_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+    
+    submitted = time.monotonic()
+    futures = {name: FANOUT_POOL.submit(timed, name, call) for name, call in calls.items()}
+    results = {}
+    try:
+        for name, future in futures.items():
+            remaining = submitted + timeouts.get(name, FANOUT_TIMEOUT_SECONDS) - time.monotonic()
+            try:
+                results[name] = future.result(timeout=max(remaining, 0))
+            except TimeoutError:
+                raise TimeoutError(f'{name} read timed out')
+    finally:
+        for future in futures.values():
+            future.cancel()  # No-op for calls already running or done
+    return results, dict(timings_ms)
+
+def new_sync_cursor():
+    """Cursor for the caller's next ?since= request, taken before reading so concurrent writes are not skipped"""
+    return encode_cursor({'t': int(time.time())})
+
+def read_changes(entity, cursor):
+    """Keys changed since a ?since= cursor as (upserted, deleted, error response)
+    
+    Only the latest change per key counts, so an item written then deleted is only a tombstone.
+    """
+    try:
+        since = int(decode_cursor(cursor)['t'])
+    except (ValueError, KeyError, TypeError):
+        return None, None, response(400, {'error': 'Invalid since cursor'})
+    if since < time.time() - CHANGE_LOG_RETENTION_SECONDS:
+        return None, None, response(410, {'error': 'since cursor expired, fetch again without since'})
+    
+    rows = query_all(
+        changes_table,
+        KeyConditionExpression='entity = :e AND change_key >= :from',
+        ExpressionAttributeValues={
+            ':e': entity,
+            ':from': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(since - CHANGE_LOG_OVERLAP_SECONDS))
+        },
+        ProjectionExpression='#k, #op',
+        ExpressionAttributeNames={'#k': 'key', '#op': 'op'}
+    )
+    latest = {}
+    for row in rows:  # Ascending change_key, so the last op per key wins
+        latest[tuple(sorted(row['key'].items()))] = row['op']
+    
+    upserted = [dict(key) for key, op in latest.items() if op == 'upsert']
+    deleted = [dict(key) for key, op in latest.items() if op == 'delete']
+    return upserted, deleted, None
+
+# Routing
+def route(method, template, auth, handler, cache_control=None):
+    """Declare a route; auth is one of public, user (any login), team, panelist or admin"""
+    return {'method': method, 'template': template, 'auth': auth, 'handler': handler, 'cache_control': cache_control}
+
+ROUTES = [
+    # Auth routes (no auth required)
+    route('POST', '/auth/team-login', 'public', lambda req: team_login(req['body'])),
+    route('POST', '/auth/panelist-login', 'public', lambda req: panelist_login(req['body'])),
+    route('POST', '/auth/team-register', 'public', lambda req: team_register(req['body'])),
+    
+    # Public routes (no auth required); the GETs are cacheable
+    route('GET', '/use-cases', 'public', lambda req: get_all_use_cases(), USE_CASES_CACHE_CONTROL),
+    route('GET', '/use-cases/{use_case_id:int}', 'public', lambda req: get_use_case(req['params']['use_case_id']), USE_CASES_CACHE_CONTROL),
+    route('GET', '/judging-criteria', 'public', lambda req: get_judging_criteria(), CRITERIA_CACHE_CONTROL),
+    route('GET', '/voting-status', 'public', lambda req: get_voting_status(), VOTING_STATUS_CACHE_CONTROL),
+    route('GET', '/team-card/{team_id}', 'public', lambda req: get_public_team_card(req['params']['team_id']), TEAM_CARD_CACHE_CONTROL),
+    route('POST', '/ai/generate', 'public', lambda req: generate_ai_text(req['body'])),
+    
+    # Team routes
+    route('GET', '/team/me', 'team', lambda req: get_team(req['auth']['team_id'])),
+    route('PUT', '/team/me', 'team', lambda req: update_team(req['auth']['team_id'], req['body'])),
+    route('GET', '/team/me/results', 'team', lambda req: get_team_results(req['auth']['team_id'])),
+    
+    # Panelist routes
+    route('GET', '/teams', 'panelist', lambda req: get_all_teams(req['query'])),
+    route('GET', '/teams/{team_id}', 'panelist', lambda req: get_team(req['params']['team_id'])),
+    route('POST', '/scores', 'panelist', lambda req: submit_score(req['auth']['panelist_id'], req['body'])),
+    route('GET', '/scores', 'user', lambda req: get_all_scores(req['auth'], req['query'])),
+    route('GET', '/scores/{team_id}', 'user', lambda req: get_team_scores(req['params']['team_id'])),
+    route('GET', '/dashboard/bootstrap', 'panelist', lambda req: get_dashboard_bootstrap(req['auth'])),
+    
+    # Admin-only use case, judging criteria and voting lock management
+    route('POST', '/use-cases', 'admin', lambda req: create_use_case(req['body'])),
+    route('PUT', '/use-cases/{use_case_id:int}', 'admin', lambda req: update_use_case(req['params']['use_case_id'], req['body'])),
+    route('DELETE', '/use-cases/{use_case_id:int}', 'admin', lambda req: delete_use_case(req['params']['use_case_id'])),
+    route('PUT', '/judging-criteria', 'admin', lambda req: update_judging_criteria(req['body'])),
+    route('PUT', '/voting-status', 'admin', lambda req: toggle_voting_status(req['body'])),
+    
+    # Admin-only team management
+    route('PUT', '/teams/{team_id}/reset-password', 'admin', lambda req: admin_reset_team_password(req['params']['team_id'], req['body'])),
+    route('DELETE', '/teams/{team_id}', 'admin', lambda req: admin_delete_team(req['params']['team_id'])),
+    
+    # Admin-only panelist management
+    route('GET', '/panelists', 'admin', lambda req: get_all_panelists()),
+    route('POST', '/panelists', 'admin', lambda req: create_panelist(req['body'])),
+    route('PUT', '/panelists/{panelist_id}/reset-password', 'admin', lambda req: admin_reset_panelist_password(req['params']['panelist_id'], req['body'])),
+    route('PUT', '/panelists/{panelist_id}/toggle-admin', 'admin', lambda req: toggle_panelist_admin(req['params']['panelist_id'], req['auth']['panelist_id'])),
+    
+    # Admin-only analytics and data export
+    route('GET', '/analytics/scores', 'admin', lambda req: get_score_analytics()),
+    route('GET', '/export/{dataset}', 'admin', lambda req: export_dataset(req['params']['dataset'], req['query'])),
+]
+
+PARAM_TYPES = {'str': str, 'int': int}
+
+AUTH_ERRORS = {
+    'team': 'Forbidden - Team access only',
+    'panelist': 'Forbidden - Panelist access only',
+    'admin': 'Forbidden - Admin access only'
+}
+
+def compile_routes(routes):
+    """Index routes: exact paths by (method, path), templated ones by (method, segment count, first segment, last segment)
+    
+    The last segment is None in the key when it is a parameter, so a lookup tries the request's
+    last segment and then None, and almost always finds a single candidate. The first segment
+    must be a literal; a template starting with a parameter raises ValueError.
+    """
+    static_routes = {}
+    dynamic_routes = {}
+    for r in routes:
+        segments = r['template'].strip('/').split('/')
+        if segments[0].startswith('{'):
+            raise ValueError(f"Route {r['method']} {r['template']} must start with a literal segment")
+        r['params'] = []
+        for i, segment in enumerate(segments):
+            if segment.startswith('{'):
+                name, _, type_name = segment[1:-1].partition(':')
+                r['params'].append((i, name, PARAM_TYPES[type_name or 'str']))
+                segments[i] = None
+        
+        if not r['params']:
+            static_routes[(r['method'], r['template'])] = r
+        else:
+            key = (r['method'], len(segments), segments[0], segments[-1])
+            # Literal segments the key doesn't already pin down (none for the current routes)
+            checks = tuple((i, segment) for i, segment in enumerate(segments[1:-1], 1) if segment is not None)
+            dynamic_routes.setdefault(key, []).append((checks, r))
+    return static_routes, dynamic_routes
+
+STATIC_ROUTES, DYNAMIC_ROUTES = compile_routes(ROUTES)
+
+def match_route(method, path):
+    """Find the route for a request, returning (route, raw path params) or (None, None)"""
+    r = STATIC_ROUTES.get((method, path))
+    if r:
+        return r, {}
+    
+    segments = path.strip('/').split('/')
+    if '' in segments:
+        return None, None  # Neither a literal nor a parameter segment can be empty
+    
+    for last in (segments[-1], None):
+        for checks, r in DYNAMIC_ROUTES.get((method, len(segments), segments[0], last), ()):
+            if checks and any(segments[i] != literal for i, literal in checks):
+                continue
+            params = {}
+            for i, name, _ in r['params']:
+                params[name] = segments[i]
+            return r, params
+    return None, None
+
+def is_authorized(auth, level):
+    """Check a verified token against a route's auth level"""
+    if level == 'user':
+        return True
+    if level == 'admin':
+        return auth.get('type') == 'panelist' and bool(auth.get('is_admin'))
+    return auth.get('type') == level
+
 def lambda_handler(event, context):
     """Main Lambda handler"""
+    global cold_start
+    if not cold_start:
+        return handle_request(event)
+    
+    # Cold start timing report: module import vs the first request (including client setup)
+    cold_start = False
+    started = time.perf_counter()
+    result = handle_request(event)
+    request_ms = (time.perf_counter() - started) * 1000
+    clients = ', '.join(f'{name} {ms:.1f}ms' for name, ms in client_init_ms.items()) or 'none'
+    print(f"Cold start: import {IMPORT_MS:.1f}ms, first request {event.get('httpMethod', '')} {event.get('path', '')} "
+          f"{request_ms:.1f}ms (client init: {clients})")
+    return result
+
+def handle_request(event):
+    """Route a single API Gateway request"""
     print(f"Event: {json.dumps(event)}")
     
     http_method = event.get('httpMethod', '')
@@ -105,6 +607,10 @@ def lambda_handler(event, context):
     if http_method == 'OPTIONS':
         return response(200, {'message': 'OK'})
     
+    r, raw_params = match_route(http_method, path)
+    if not r:
+        return response(404, {'error': 'Not found'})
+    
     # Parse body
     body = {}
     if event.get('body'):
@@ -113,155 +619,28 @@ def lambda_handler(event, context):
         except:
             pass
     
-    # Route handling
     try:
-        # Auth routes (no auth required)
-        if path == '/auth/team-login' and http_method == 'POST':
-            return team_login(body)
-        
-        if path == '/auth/panelist-login' and http_method == 'POST':
-            return panelist_login(body)
-        
-        if path == '/auth/team-register' and http_method == 'POST':
-            return team_register(body)
-        
-        # Public use case routes (no auth required)
-        if path == '/use-cases' and http_method == 'GET':
-            return get_all_use_cases()
-        
-        if path.startswith('/use-cases/') and http_method == 'GET':
-            use_case_id = path.split('/')[-1]
-            return get_use_case(use_case_id)
-        
-        # Public judging criteria route (no auth required)
-        if path == '/judging-criteria' and http_method == 'GET':
-            return get_judging_criteria()
-        
-        # Public voting status route (no auth required)
-        if path == '/voting-status' and http_method == 'GET':
-            return get_voting_status()
-        
-        # Public team card route (no auth required, limited data for sharing)
-        if path.startswith('/team-card/') and http_method == 'GET':
-            team_id = path.split('/')[-1]
-            return get_public_team_card(team_id)
-        
-        # Public AI generation route (no auth required for registration)
-        if path == '/ai/generate' and http_method == 'POST':
-            return generate_ai_text(body)
-        
-        # Protected routes - require auth
-        auth = get_auth_context(event)
-        if not auth:
-            return response(401, {'error': 'Unauthorized - Invalid or missing token'})
-        
-        # Team routes
-        if path == '/team/me' and http_method == 'GET':
-            if auth.get('type') != 'team':
-                return response(403, {'error': 'Forbidden - Team access only'})
-            return get_team(auth['team_id'])
-        
-        if path == '/team/me' and http_method == 'PUT':
-            if auth.get('type') != 'team':
-                return response(403, {'error': 'Forbidden - Team access only'})
-            return update_team(auth['team_id'], body)
-        
-        if path == '/team/me/results' and http_method == 'GET':
-            if auth.get('type') != 'team':
-                return response(403, {'error': 'Forbidden - Team access only'})
-            return get_team_results(auth['team_id'])
-        
-        # Panelist routes
-        if path == '/teams' and http_method == 'GET':
-            if auth.get('type') != 'panelist':
-                return response(403, {'error': 'Forbidden - Panelist access only'})
-            return get_all_teams()
-        
-        if path.startswith('/teams/') and http_method == 'GET':
-            if auth.get('type') != 'panelist':
-                return response(403, {'error': 'Forbidden - Panelist access only'})
-            team_id = path.split('/')[-1]
-            return get_team(team_id)
-        
-        if path == '/scores' and http_method == 'POST':
-            if auth.get('type') != 'panelist':
-                return response(403, {'error': 'Forbidden - Panelist access only'})
-            return submit_score(auth['panelist_id'], body)
-        
-        if path == '/scores' and http_method == 'GET':
-            return get_all_scores()
-        
-        if path.startswith('/scores/') and http_method == 'GET':
-            team_id = path.split('/')[-1]
-            return get_team_scores(team_id)
-        
-        # Admin-only use case management routes
-        if path == '/use-cases' and http_method == 'POST':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            return create_use_case(body)
-        
-        if path.startswith('/use-cases/') and http_method == 'PUT':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            use_case_id = path.split('/')[-1]
-            return update_use_case(use_case_id, body)
-        
-        if path.startswith('/use-cases/') and http_method == 'DELETE':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            use_case_id = path.split('/')[-1]
-            return delete_use_case(use_case_id)
-        
-        # Admin-only judging criteria management
-        if path == '/judging-criteria' and http_method == 'PUT':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            return update_judging_criteria(body)
-        
-        # Admin-only voting lock management
-        if path == '/voting-status' and http_method == 'PUT':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            return toggle_voting_status(body)
-        
-        # Admin-only team management
-        if path.startswith('/teams/') and path.endswith('/reset-password') and http_method == 'PUT':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            team_id = path.split('/')[2]
-            return admin_reset_team_password(team_id, body)
-        
-        if path.startswith('/teams/') and http_method == 'DELETE':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            team_id = path.split('/')[-1]
-            return admin_delete_team(team_id)
-        
-        # Admin-only panelist management
-        if path == '/panelists' and http_method == 'GET':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            return get_all_panelists()
-        
-        if path == '/panelists' and http_method == 'POST':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            return create_panelist(body)
-        
-        if path.startswith('/panelists/') and path.endswith('/reset-password') and http_method == 'PUT':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            panelist_id = path.split('/')[2]
-            return admin_reset_panelist_password(panelist_id, body)
-        
-        if path.startswith('/panelists/') and path.endswith('/toggle-admin') and http_method == 'PUT':
-            if auth.get('type') != 'panelist' or not auth.get('is_admin'):
-                return response(403, {'error': 'Forbidden - Admin access only'})
-            panelist_id = path.split('/')[2]
-            return toggle_panelist_admin(panelist_id, auth['panelist_id'])
-        
-        return response(404, {'error': 'Not found'})
+        auth = None
+        if r['auth'] != 'public':
+            auth = get_auth_context(event)
+            if not auth:
+                return response(401, {'error': 'Unauthorized - Invalid or missing token'})
+            if not is_authorized(auth, r['auth']):
+                return response(403, {'error': AUTH_ERRORS[r['auth']]})
+        
+        params = {}
+        for _, name, convert in r['params']:
+            try:
+                params[name] = convert(raw_params[name])
+            except ValueError:
+                return response(400, {'error': f'Invalid {name}'})
+        
+        query = event.get('queryStringParameters') or {}
+        result = r['handler']({'event': event, 'body': body, 'auth': auth, 'params': params, 'query': query})
+        
+        if r['cache_control']:
+            result = conditional_response(event, result, r['cache_control'])
+        return result
         
     except Exception as e:
         print(f"Error: {e}")
@@ -437,7 +816,7 @@ Respond with ONLY the rewritten description, no explanation."""
             ]
         })
         
-        bedrock_response = bedrock_runtime.invoke_model(
+        bedrock_response = get_aws('client', 'bedrock-runtime').invoke_model(
             modelId="anthropic.claude-3-haiku-20240307-v1:0",
             body=bedrock_body,
             contentType="application/json",
@@ -483,6 +862,37 @@ def get_public_team_card(team_id):
         return response(500, {'error': str(e)})
 
 # Team handlers
+
+# Attributes GET /teams can return; the password is left out by projection, so it is never read
+TEAM_FIELDS = [
+    'team_id', 'team_name', 'catchphrase', 'use_case', 'use_case_name', 'solution_description',
+    'services_used', 'members', 'created_at', 'updated_at'
+]
+TEAM_SUMMARY_FIELDS = ['team_id', 'team_name', 'use_case', 'use_case_name']  # Enough for the scoring grid
+
+def team_projection(query):
+    """Projection kwargs for ?fields=a,b or ?summary as (kwargs, error response)"""
+    if 'fields' in query:
+        fields = [field.strip() for field in query['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in TEAM_FIELDS]
+        if unknown:
+            return None, response(400, {'error': f"Unknown fields: {', '.join(unknown)}"})
+    elif query.get('summary', 'false').lower() not in ('false', '0'):
+        fields = TEAM_SUMMARY_FIELDS
+    else:
+        fields = TEAM_FIELDS
+    
+    # team_id is always returned so clients can key and merge results
+    fields = ['team_id'] + [field for field in fields if field != 'team_id']
+    return {
+        'ProjectionExpression': ', '.join(f'#f{i}' for i in range(len(fields))),
+        'ExpressionAttributeNames': {f'#f{i}': field for i, field in enumerate(fields)}
+    }, None
+
+def load_teams(projection):
+    """Every team, read through a team_projection()"""
+    return scan_all(teams_table, SCAN_SEGMENTS, **projection)
+
 def get_team(team_id):
     """Get team details"""
     try:
@@ -514,8 +924,7 @@ def update_team(team_id, body):
         if 'use_case' in body:
             use_case = int(body['use_case'])
             # Get use case name from database
-            uc_result = use_cases_table.get_item(Key={'use_case_id': use_case})
-            uc_item = uc_result.get('Item')
+            uc_item = find_use_case(use_case)
             if not uc_item or not uc_item.get('active', True):
                 return response(400, {'error': 'Invalid use_case'})
             update_expr.append('use_case = :uc')
@@ -563,32 +972,37 @@ def update_team(team_id, body):
     except Exception as e:
         return response(500, {'error': str(e)})
 
-def get_all_teams():
-    """Get all teams (for panelists)"""
+def get_all_teams(query):
+    """Get all teams (for panelists), or only the teams changed since ?since=<cursor>
+    
+    ?fields=team_name,members limits the attributes returned and ?summary returns
+    just the names and use cases.
+    """
     try:
-        result = teams_table.scan()
-        teams = result.get('Items', [])
+        projection, error = team_projection(query)
+        if error:
+            return error
+        cursor = new_sync_cursor()
         
-        # Remove passwords
-        for team in teams:
-            team.pop('password', None)
+        if 'since' not in query:
+            return response(200, {'teams': load_teams(projection), 'cursor': cursor})
         
-        return response(200, {'teams': teams})
+        upserted, deleted, error = read_changes('teams', query['since'])
+        if error:
+            return error
+        teams = batch_get_items(teams_table, upserted, ConsistentRead=True, **projection)
+        
+        # Teams deleted after their change was logged are tombstones too
+        found = {team['team_id'] for team in teams}
+        deleted_ids = [key['team_id'] for key in deleted] + [key['team_id'] for key in upserted if key['team_id'] not in found]
+        
+        return response(200, {'teams': teams, 'deleted': deleted_ids, 'cursor': cursor})
     except Exception as e:
         return response(500, {'error': str(e)})
 
 # Score handlers
 def submit_score(panelist_id, body):
     """Submit or update a score"""
-    # Check if voting is locked
-    try:
-        criteria_result = judging_criteria_table.get_item(Key={'criteria_id': 'main'})
-        criteria = criteria_result.get('Item', {})
-        if criteria.get('voting_locked', False):
-            return response(403, {'error': 'Voting is locked - scores can no longer be submitted or modified'})
-    except Exception as e:
-        print(f"Error checking voting status: {e}")
-    
     team_id = body.get('team_id', '')
     
     if not team_id:
@@ -604,24 +1018,53 @@ def submit_score(panelist_id, body):
             return response(400, {'error': f'{field} must be between 1 and 5'})
     
     try:
-        # Verify team exists
-        team_result = teams_table.get_item(Key={'team_id': team_id})
-        if not team_result.get('Item'):
-            return response(404, {'error': 'Team not found'})
-        
         total = sum(body[f] for f in required_fields)
         
-        scores_table.put_item(Item={
-            'team_id': team_id,
-            'panelist_id': panelist_id,
-            'presentation': Decimal(str(body['presentation'])),
-            'innovation': Decimal(str(body['innovation'])),
-            'functionality': Decimal(str(body['functionality'])),
-            'aws_well_architected': Decimal(str(body['aws_well_architected'])),
-            'total': Decimal(str(total)),
-            'comments': body.get('comments', ''),
-            'submitted_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-        })
+        # One transaction: voting must be unlocked and the team must exist at the moment the score is written
+        client = scores_table.meta.client
+        transact_items = [
+            {'ConditionCheck': {
+                'TableName': judging_criteria_table.name,
+                'Key': {'criteria_id': 'main'},
+                'ConditionExpression': 'attribute_not_exists(voting_locked) OR voting_locked = :unlocked',
+                'ExpressionAttributeValues': {':unlocked': False}
+            }},
+            {'ConditionCheck': {
+                'TableName': teams_table.name,
+                'Key': {'team_id': team_id},
+                'ConditionExpression': 'attribute_exists(team_id)'
+            }},
+            {'Put': {
+                'TableName': scores_table.name,
+                'Item': {
+                    'team_id': team_id,
+                    'panelist_id': panelist_id,
+                    'presentation': Decimal(str(body['presentation'])),
+                    'innovation': Decimal(str(body['innovation'])),
+                    'functionality': Decimal(str(body['functionality'])),
+                    'aws_well_architected': Decimal(str(body['aws_well_architected'])),
+                    'total': Decimal(str(total)),
+                    'comments': body.get('comments', ''),
+                    'submitted_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+                }
+            }}
+        ]
+        for attempt in range(1, TRANSACT_MAX_ATTEMPTS + 1):
+            try:
+                client.transact_write_items(TransactItems=transact_items)
+                break
+            except client.exceptions.TransactionCanceledException as e:
+                # Reasons are listed in TransactItems order
+                reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+                if reasons[0:1] == ['ConditionalCheckFailed']:
+                    return response(403, {'error': 'Voting is locked - scores can no longer be submitted or modified'})
+                if reasons[1:2] == ['ConditionalCheckFailed']:
+                    return response(404, {'error': 'Team not found'})
+                if 'TransactionConflict' not in reasons:
+                    raise
+                if attempt == TRANSACT_MAX_ATTEMPTS:
+                    return response(503, {'error': 'Too many scores are being submitted at once, please try again'})
+                time.sleep(random.uniform(0, min(0.05 * 2 ** attempt, 1)))
         
         return response(200, {
             'message': 'Score submitted successfully',
@@ -632,80 +1075,114 @@ def submit_score(panelist_id, body):
     except Exception as e:
         return response(500, {'error': str(e)})
 
-def get_all_scores():
-    """Get all scores with aggregations"""
+def leaderboard_entry(row):
+    """Turn a leaderboard table row (running sums) into per-category averages"""
+    n = row['num_scores']
+    return {
+        'team_id': row['team_id'],
+        'avg_presentation': row.get('sum_presentation', 0) / n,
+        'avg_innovation': row.get('sum_innovation', 0) / n,
+        'avg_functionality': row.get('sum_functionality', 0) / n,
+        'avg_aws_well_architected': row.get('sum_aws_well_architected', 0) / n,
+        'avg_total': row.get('sum_total', 0) / n,
+        'num_scores': n
+    }
+
+def rank_leaderboard(rows):
+    """Leaderboard entries for the rows that have scores, best average total first"""
+    leaderboard = [leaderboard_entry(row) for row in rows if row.get('num_scores', 0) > 0]
+    
+    # Sort by average total
+    leaderboard.sort(key=lambda x: x['avg_total'], reverse=True)
+    return leaderboard
+
+def load_scoreboard(auth):
+    """The leaderboard and the caller's own scores, as returned by GET /scores"""
+    # Per-team running sums are kept up to date by score_stream_handler
+    leaderboard = rank_leaderboard(scan_all(leaderboard_table, SCAN_SEGMENTS))
+    
+    # Panelists get back their own scores so the dashboard can prefill the scoring forms
+    my_scores = []
+    if auth.get('type') == 'panelist':
+        keys = [{'team_id': item['team_id'], 'panelist_id': auth['panelist_id']} for item in leaderboard]
+        my_scores = batch_get_items(scores_table, keys)
+    
+    return {'leaderboard': leaderboard, 'all_scores': my_scores}
+
+def get_all_scores(auth, query):
+    """Get the leaderboard and the caller's own scores, or only what changed since ?since=<cursor>
+    
+    Delta responses carry the changed leaderboard rows, plus `deleted` (teams that left the
+    leaderboard) and `deleted_scores` (teams whose score from the caller was removed).
+    """
     try:
-        result = scores_table.scan()
-        scores = result.get('Items', [])
-        
-        # Aggregate by team
-        team_scores = {}
-        for score in scores:
-            team_id = score['team_id']
-            if team_id not in team_scores:
-                team_scores[team_id] = {
-                    'team_id': team_id,
-                    'scores': [],
-                    'avg_presentation': 0,
-                    'avg_innovation': 0,
-                    'avg_functionality': 0,
-                    'avg_aws_well_architected': 0,
-                    'avg_total': 0,
-                    'num_scores': 0
-                }
-            team_scores[team_id]['scores'].append(score)
-            team_scores[team_id]['num_scores'] += 1
-        
-        # Calculate averages
-        for team_id, data in team_scores.items():
-            n = data['num_scores']
-            if n > 0:
-                data['avg_presentation'] = sum(s['presentation'] for s in data['scores']) / n
-                data['avg_innovation'] = sum(s['innovation'] for s in data['scores']) / n
-                data['avg_functionality'] = sum(s['functionality'] for s in data['scores']) / n
-                data['avg_aws_well_architected'] = sum(s['aws_well_architected'] for s in data['scores']) / n
-                data['avg_total'] = sum(s['total'] for s in data['scores']) / n
-        
-        # Sort by average total
-        leaderboard = sorted(team_scores.values(), key=lambda x: x['avg_total'], reverse=True)
-        
-        return response(200, {'leaderboard': leaderboard, 'all_scores': scores})
+        cursor = new_sync_cursor()
+        
+        if 'since' not in query:
+            return response(200, {**load_scoreboard(auth), 'cursor': cursor})
+        
+        upserted, deleted, error = read_changes('scores', query['since'])
+        if error:
+            return error
+        team_ids = sorted({key['team_id'] for key in upserted + deleted})
+        rows = batch_get_items(leaderboard_table, [{'team_id': team_id} for team_id in team_ids], ConsistentRead=True)
+        leaderboard = rank_leaderboard(rows)
+        
+        panelist_id = auth.get('panelist_id') if auth.get('type') == 'panelist' else None
+        my_scores = []
+        if panelist_id:
+            my_keys = [key for key in upserted if key['panelist_id'] == panelist_id]
+            my_scores = batch_get_items(scores_table, my_keys, ConsistentRead=True)
+        
+        ranked = {item['team_id'] for item in leaderboard}
+        found = {score['team_id'] for score in my_scores}
+        return response(200, {
+            'leaderboard': leaderboard,
+            'all_scores': my_scores,
+            'deleted': [team_id for team_id in team_ids if team_id not in ranked],
+            'deleted_scores': [
+                key['team_id'] for key in upserted + deleted
+                if key['panelist_id'] == panelist_id and key['team_id'] not in found
+            ],
+            'cursor': cursor
+        })
     except Exception as e:
         return response(500, {'error': str(e)})
 
 def get_team_scores(team_id):
     """Get scores for a specific team"""
     try:
-        result = scores_table.query(
+        scores = query_all(
+            scores_table,
             KeyConditionExpression='team_id = :tid',
             ExpressionAttributeValues={':tid': team_id}
         )
-        scores = result.get('Items', [])
         
         return response(200, {'team_id': team_id, 'scores': scores})
     except Exception as e:
         return response(500, {'error': str(e)})
 
 # Use Case handlers
+def load_active_use_cases():
+    """Active use cases in display order"""
+    use_cases = load_use_cases()
+    
+    # Filter to active only and sort by sort_order
+    active_use_cases = [uc for uc in use_cases if uc.get('active', True)]
+    active_use_cases.sort(key=lambda x: x.get('sort_order', 999))
+    return active_use_cases
+
 def get_all_use_cases():
     """Get all active use cases (public)"""
     try:
-        result = use_cases_table.scan()
-        use_cases = result.get('Items', [])
-        
-        # Filter to active only and sort by sort_order
-        active_use_cases = [uc for uc in use_cases if uc.get('active', True)]
-        active_use_cases.sort(key=lambda x: x.get('sort_order', 999))
-        
-        return response(200, {'use_cases': active_use_cases})
+        return response(200, {'use_cases': load_active_use_cases()})
     except Exception as e:
         return response(500, {'error': str(e)})
 
 def get_use_case(use_case_id):
     """Get a single use case by ID (public)"""
     try:
-        result = use_cases_table.get_item(Key={'use_case_id': int(use_case_id)})
-        use_case = result.get('Item')
+        use_case = find_use_case(int(use_case_id))
         
         if not use_case:
             return response(404, {'error': 'Use case not found'})
@@ -725,33 +1202,37 @@ def create_use_case(body):
             return response(400, {'error': f'{field} is required'})
     
     try:
-        # Get next use_case_id
-        result = use_cases_table.scan(ProjectionExpression='use_case_id')
-        existing_ids = [item['use_case_id'] for item in result.get('Items', [])]
-        next_id = max(existing_ids) + 1 if existing_ids else 1
-        
-        use_case = {
-            'use_case_id': next_id,
-            'name': body['name'],
-            'archetype': body['archetype'],
-            'quote': body['quote'],
-            'background': body['background'],
-            'reality': body['reality'],
-            'persona': body['persona'],
-            'tension': body['tension'],
-            'focus': body['focus'],
-            'challenges': body['challenges'],
-            'values': body['values'],
-            'closing': body.get('closing', ''),
-            'ascii_logo': body.get('ascii_logo', ''),
-            'loading_message': body.get('loading_message', ''),
-            'sort_order': body.get('sort_order', next_id),
-            'active': body.get('active', True),
-            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
-            'updated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-        }
+        while True:
+            next_id = next_sequence_value('use_case_id')
+            use_case = {
+                'use_case_id': next_id,
+                'name': body['name'],
+                'archetype': body['archetype'],
+                'quote': body['quote'],
+                'background': body['background'],
+                'reality': body['reality'],
+                'persona': body['persona'],
+                'tension': body['tension'],
+                'focus': body['focus'],
+                'challenges': body['challenges'],
+                'values': body['values'],
+                'closing': body.get('closing', ''),
+                'ascii_logo': body.get('ascii_logo', ''),
+                'loading_message': body.get('loading_message', ''),
+                'sort_order': body.get('sort_order', next_id),
+                'active': body.get('active', True),
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'updated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }
+            
+            try:
+                use_cases_table.put_item(Item=use_case, ConditionExpression='attribute_not_exists(use_case_id)')
+                break
+            except use_cases_table.meta.client.exceptions.ConditionalCheckFailedException:
+                # The counter is behind existing IDs (e.g. not seeded yet); take the next value
+                print(f"use_case_id {next_id} already taken, allocating another")
         
-        use_cases_table.put_item(Item=use_case)
+        invalidate_cache('use_cases')
         
         return response(201, {'message': 'Use case created', 'use_case': use_case})
     except Exception as e:
@@ -814,6 +1295,7 @@ def update_use_case(use_case_id, body):
         
         result = use_cases_table.update_item(**update_params)
         use_case = result.get('Attributes', {})
+        invalidate_cache('use_cases')
         
         return response(200, use_case)
     except ValueError:
@@ -840,6 +1322,7 @@ def delete_use_case(use_case_id):
                 ':ua': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
             }
         )
+        invalidate_cache('use_cases')
         
         return response(200, {'message': 'Use case deactivated'})
     except ValueError:
@@ -851,13 +1334,12 @@ def delete_use_case(use_case_id):
 def get_judging_criteria():
     """Get the judging criteria (public)"""
     try:
-        result = judging_criteria_table.get_item(Key={'criteria_id': 'main'})
-        criteria = result.get('Item')
+        criteria = load_criteria()
         
         if not criteria:
             return response(404, {'error': 'Judging criteria not found'})
         
-        return response(200, criteria)
+        return response(200, public_criteria(criteria))
     except Exception as e:
         return response(500, {'error': str(e)})
 
@@ -886,23 +1368,25 @@ def update_judging_criteria(body):
             ExpressionAttributeValues=expr_values,
             ReturnValues='ALL_NEW'
         )
+        invalidate_cache('criteria')
         
-        return response(200, result.get('Attributes', {}))
+        return response(200, public_criteria(result.get('Attributes', {})))
     except Exception as e:
         return response(500, {'error': str(e)})
 
 # Voting status handlers
+def voting_status(criteria):
+    """Voting lock fields of the criteria document"""
+    return {
+        'voting_locked': criteria.get('voting_locked', False),
+        'locked_at': criteria.get('voting_locked_at'),
+        'locked_by': criteria.get('voting_locked_by')
+    }
+
 def get_voting_status():
     """Get voting lock status (public)"""
     try:
-        result = judging_criteria_table.get_item(Key={'criteria_id': 'main'})
-        criteria = result.get('Item', {})
-        
-        return response(200, {
-            'voting_locked': criteria.get('voting_locked', False),
-            'locked_at': criteria.get('voting_locked_at'),
-            'locked_by': criteria.get('voting_locked_by')
-        })
+        return response(200, voting_status(load_criteria()))
     except Exception as e:
         return response(500, {'error': str(e)})
 
@@ -926,22 +1410,33 @@ def toggle_voting_status(body):
                 },
                 ReturnValues='ALL_NEW'
             )
+            invalidate_cache('criteria')
+            
+            # Scores are final now, so team results are computed once instead of per request
+            try:
+                snapshot_id = create_results_snapshot()
+            except Exception as e:
+                snapshot_id = None
+                print(f"Results snapshot failed, results will be computed live: {e}")
+            
             return response(200, {
                 'message': 'Voting has been locked. No more scores can be submitted.',
                 'voting_locked': True,
-                'locked_at': result.get('Attributes', {}).get('voting_locked_at')
+                'locked_at': result.get('Attributes', {}).get('voting_locked_at'),
+                'results_snapshot_id': snapshot_id
             })
         else:
             # Unlock voting
             result = judging_criteria_table.update_item(
                 Key={'criteria_id': 'main'},
-                UpdateExpression='SET voting_locked = :vl, updated_at = :ua REMOVE voting_locked_at, voting_locked_by',
+                UpdateExpression='SET voting_locked = :vl, updated_at = :ua REMOVE voting_locked_at, voting_locked_by, results_snapshot_id',
                 ExpressionAttributeValues={
                     ':vl': False,
                     ':ua': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
                 },
                 ReturnValues='ALL_NEW'
             )
+            invalidate_cache('criteria')
             return response(200, {
                 'message': 'Voting has been unlocked. Panelists can now submit scores.',
                 'voting_locked': False
@@ -949,102 +1444,338 @@ def toggle_voting_status(body):
     except Exception as e:
         return response(500, {'error': str(e)})
 
+def rank_results(score_rows):
+    """RankIndex of average totals from score rows carrying team_id and total"""
+    team_totals = {}
+    for score in score_rows:
+        tid = score['team_id']
+        if tid not in team_totals:
+            team_totals[tid] = {'total': 0, 'count': 0}
+        team_totals[tid]['total'] += score['total']
+        team_totals[tid]['count'] += 1
+    
+    # Calculate averages
+    return RankIndex({tid: data['total'] / data['count'] for tid, data in team_totals.items() if data['count'] > 0})
+
+def named_leaderboard(ranking, team_names):
+    """Results leaderboard rows; tied teams share a position, so clients find their own row by team_id"""
+    return [
+        {
+            'position': rank,
+            'team_id': tid,
+            'team_name': team_names.get(tid, tid),
+            'avg_total': round(avg_total, 2)
+        }
+        for rank, tid, avg_total in ranking.ranked()
+    ]
+
+def team_results(team_id, team_scores, panelist_names, ranking, leaderboard):
+    """The GET /team/me/results payload for one team, given the ranking and its named_leaderboard"""
+    # Calculate team's average
+    if team_scores:
+        num_scores = len(team_scores)
+        avg_presentation = sum(s['presentation'] for s in team_scores) / num_scores
+        avg_innovation = sum(s['innovation'] for s in team_scores) / num_scores
+        avg_functionality = sum(s['functionality'] for s in team_scores) / num_scores
+        avg_aws = sum(s['aws_well_architected'] for s in team_scores) / num_scores
+        avg_total = sum(s['total'] for s in team_scores) / num_scores
+    else:
+        avg_presentation = avg_innovation = avg_functionality = avg_aws = avg_total = 0
+        num_scores = 0
+    
+    feedback = []
+    for score in team_scores:
+        feedback.append({
+            'panelist_name': panelist_names.get(score['panelist_id'], score['panelist_id']),
+            'presentation': score.get('presentation'),
+            'innovation': score.get('innovation'),
+            'functionality': score.get('functionality'),
+            'aws_well_architected': score.get('aws_well_architected'),
+            'total': score.get('total'),
+            'comments': score.get('comments', '')
+        })
+    
+    return {
+        'team_id': team_id,
+        'position': ranking.rank(team_id),
+        'total_teams': len(ranking),
+        'scores': {
+            'presentation': round(avg_presentation, 2),
+            'innovation': round(avg_innovation, 2),
+            'functionality': round(avg_functionality, 2),
+            'aws_well_architected': round(avg_aws, 2),
+            'total': round(avg_total, 2)
+        },
+        'num_reviews': num_scores,
+        'feedback': feedback,
+        'leaderboard': leaderboard
+    }
+
+def create_results_snapshot():
+    """Compute every team's results once and store them under a new snapshot_id
+    
+    Called when voting locks, after which scores can't change. Reads are strongly
+    consistent so scores committed just before the lock are included.
+    """
+    started = time.perf_counter()
+    snapshot_id = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime()) + '-' + base64.urlsafe_b64encode(os.urandom(6)).decode()
+    
+    results, _ = fan_out({
+        'scores': lambda: scan_all(scores_table, SCAN_SEGMENTS, ConsistentRead=True),
+        'teams': lambda: scan_all(teams_table, SCAN_SEGMENTS, ConsistentRead=True, ProjectionExpression='team_id, team_name')
+    })
+    scores_by_team = {}
+    for score in results['scores']:
+        scores_by_team.setdefault(score['team_id'], []).append(score)
+    panelist_names = get_panelist_names([s['panelist_id'] for s in results['scores']])
+    team_names = {t['team_id']: t.get('team_name', t['team_id']) for t in results['teams']}
+    ranking = rank_results(results['scores'])
+    leaderboard = named_leaderboard(ranking, team_names)
+    
+    created_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    with results_table.batch_writer() as batch:
+        for team_id in team_names.keys() | scores_by_team.keys():
+            batch.put_item(Item={
+                'team_id': team_id,
+                'snapshot_id': snapshot_id,
+                'created_at': created_at,
+                'results': team_results(team_id, scores_by_team.get(team_id, []), panelist_names, ranking, leaderboard)
+            })
+    
+    # Publish the snapshot only once every team's item is written
+    judging_criteria_table.update_item(
+        Key={'criteria_id': 'main'},
+        UpdateExpression='SET results_snapshot_id = :sid',
+        ConditionExpression='voting_locked = :locked',
+        ExpressionAttributeValues={':sid': snapshot_id, ':locked': True}
+    )
+    invalidate_cache('criteria')
+    print(f"Results snapshot {snapshot_id} written for {len(team_names.keys() | scores_by_team.keys())} teams "
+          f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+    return snapshot_id
+
 def get_team_results(team_id):
     """Get team's scores and leaderboard position (team only, requires voting locked)"""
     try:
-        # Check if voting is locked
-        criteria_result = judging_criteria_table.get_item(Key={'criteria_id': 'main'})
-        criteria = criteria_result.get('Item', {})
+        # Check if voting is locked; read past the warm cache so a lock or unlock applies at once
+        criteria = judging_criteria_table.get_item(Key={'criteria_id': 'main'}, ConsistentRead=True).get('Item', {})
         
         if not criteria.get('voting_locked', False):
             return response(403, {'error': 'Results are not available yet. Voting must be locked first.'})
         
-        # Get this team's scores
-        scores_result = scores_table.query(
-            KeyConditionExpression='team_id = :tid',
-            ExpressionAttributeValues={':tid': team_id}
-        )
-        team_scores = scores_result.get('Items', [])
-        
-        # Calculate team's average
-        if team_scores:
-            num_scores = len(team_scores)
-            avg_presentation = sum(s['presentation'] for s in team_scores) / num_scores
-            avg_innovation = sum(s['innovation'] for s in team_scores) / num_scores
-            avg_functionality = sum(s['functionality'] for s in team_scores) / num_scores
-            avg_aws = sum(s['aws_well_architected'] for s in team_scores) / num_scores
-            avg_total = sum(s['total'] for s in team_scores) / num_scores
-        else:
-            avg_presentation = avg_innovation = avg_functionality = avg_aws = avg_total = 0
-            num_scores = 0
-        
-        # Get panelist names for feedback
-        feedback = []
-        for score in team_scores:
-            panelist_result = panelists_table.get_item(Key={'panelist_id': score['panelist_id']})
-            panelist = panelist_result.get('Item', {})
-            feedback.append({
-                'panelist_name': panelist.get('name', score['panelist_id']),
-                'presentation': score.get('presentation'),
-                'innovation': score.get('innovation'),
-                'functionality': score.get('functionality'),
-                'aws_well_architected': score.get('aws_well_architected'),
-                'total': score.get('total'),
-                'comments': score.get('comments', '')
-            })
+        # Serve the snapshot frozen at lock time when there is one
+        snapshot_id = criteria.get('results_snapshot_id')
+        if snapshot_id:
+            item = results_table.get_item(Key={'team_id': team_id}, ConsistentRead=True).get('Item')
+            if item and item.get('snapshot_id') == snapshot_id:
+                return response(200, item['results'])
+            print(f"No results snapshot {snapshot_id} for {team_id}, computing live")
+        
+        def load_team_feedback():
+            # Get this team's scores, then the panelist names for feedback
+            team_scores = query_all(
+                scores_table,
+                KeyConditionExpression='team_id = :tid',
+                ExpressionAttributeValues={':tid': team_id}
+            )
+            return team_scores, get_panelist_names([s['panelist_id'] for s in team_scores])
+        
+        # The remaining reads are independent, so the slowest one sets the latency
+        started = time.perf_counter()
+        results, timings_ms = fan_out({
+            'team_scores': load_team_feedback,
+            'all_scores': lambda: scan_all(scores_table, SCAN_SEGMENTS, ProjectionExpression='team_id, #t', ExpressionAttributeNames={'#t': 'total'}),
+            'teams': lambda: scan_all(teams_table, SCAN_SEGMENTS, ProjectionExpression='team_id, team_name')
+        })
+        print(f"Team results reads for {team_id} (ms): {timings_ms}, wall {(time.perf_counter() - started) * 1000:.1f}")
+        team_scores, panelist_names = results['team_scores']
         
-        # Get all teams' scores for leaderboard position
-        all_scores_result = scores_table.scan()
-        all_scores = all_scores_result.get('Items', [])
+        # Get team names for leaderboard
+        team_names = {t['team_id']: t.get('team_name', t['team_id']) for t in results['teams']}
         
-        team_totals = {}
-        for score in all_scores:
-            tid = score['team_id']
-            if tid not in team_totals:
-                team_totals[tid] = {'total': 0, 'count': 0}
-            team_totals[tid]['total'] += score['total']
-            team_totals[tid]['count'] += 1
+        ranking = rank_results(results['all_scores'])
+        return response(200, team_results(team_id, team_scores, panelist_names, ranking, named_leaderboard(ranking, team_names)))
+    except TimeoutError as e:
+        return response(504, {'error': str(e)})
+    except Exception as e:
+        return response(500, {'error': str(e)})
+
+# Dashboard bootstrap handler
+def get_dashboard_bootstrap(auth):
+    """Everything panelist-dashboard.html loads on open, read concurrently in one request
+    
+    Combines GET /teams, /scores, /use-cases, /judging-criteria and /voting-status, and
+    reports how long each read took in timings_ms.
+    """
+    try:
+        projection, _ = team_projection({})
+        cursor = new_sync_cursor()  # Valid for ?since= on both /teams and /scores
+        
+        started = time.perf_counter()
+        results, timings_ms = fan_out({
+            'teams': lambda: load_teams(projection),
+            'scores': lambda: load_scoreboard(auth),
+            'use_cases': load_active_use_cases,
+            'judging_criteria': load_criteria
+        })
+        timings_ms['total'] = round((time.perf_counter() - started) * 1000, 1)
+        print(f"Dashboard bootstrap timings (ms): {timings_ms}")
         
-        # Calculate averages and sort
-        leaderboard = []
-        for tid, data in team_totals.items():
-            avg = data['total'] / data['count'] if data['count'] > 0 else 0
-            leaderboard.append({'team_id': tid, 'avg_total': avg})
+        criteria = results['judging_criteria'] or {}
+        return response(200, {
+            'teams': results['teams'],
+            'leaderboard': results['scores']['leaderboard'],
+            'all_scores': results['scores']['all_scores'],
+            'use_cases': results['use_cases'],
+            'judging_criteria': public_criteria(criteria),
+            'voting_status': voting_status(criteria),
+            'cursor': cursor,
+            'timings_ms': timings_ms
+        })
+    except TimeoutError as e:
+        return response(504, {'error': str(e)})
+    except Exception as e:
+        return response(500, {'error': str(e)})
+
+# Score analytics handler
+def get_score_analytics():
+    """Category means, variance, judge-normalized scores and per-use-case rankings (admin only)"""
+    try:
+        results, timings_ms = fan_out({
+            'scores': lambda: scan_all(scores_table, SCAN_SEGMENTS),
+            'teams': lambda: scan_all(teams_table, SCAN_SEGMENTS, ProjectionExpression='team_id, team_name, use_case')
+        })
         
-        leaderboard.sort(key=lambda x: x['avg_total'], reverse=True)
+        started = time.perf_counter()
+        analytics = analyze_scores(results['scores'], results['teams'])
+        timings_ms['compute'] = round((time.perf_counter() - started) * 1000, 1)
         
-        # Find this team's position
-        position = next((i + 1 for i, item in enumerate(leaderboard) if item['team_id'] == team_id), None)
-        total_teams = len(leaderboard)
+        names = get_panelist_names([p['panelist_id'] for p in analytics['panelists']])
+        for panelist in analytics['panelists']:
+            panelist['name'] = names.get(panelist['panelist_id'], panelist['panelist_id'])
         
-        # Get team names for leaderboard
-        teams_result = teams_table.scan()
-        all_teams = {t['team_id']: t.get('team_name', t['team_id']) for t in teams_result.get('Items', [])}
-        
-        leaderboard_with_names = [
-            {
-                'position': i + 1,
-                'team_name': all_teams.get(item['team_id'], item['team_id']),
-                'avg_total': round(item['avg_total'], 2)
+        print(f"Score analytics over {len(results['scores'])} scores (ms): {timings_ms}")
+        return response(200, {**analytics, 'timings_ms': timings_ms})
+    except TimeoutError as e:
+        return response(504, {'error': str(e)})
+    except Exception as e:
+        return response(500, {'error': str(e)})
+
+# Export handlers
+EXPORT_COLUMNS = {
+    'teams': ['team_id', 'team_name', 'catchphrase', 'use_case', 'use_case_name', 'solution_description',
+              'services_used', 'members', 'created_at', 'updated_at'],
+    'scores': ['team_id', 'panelist_id', 'presentation', 'innovation', 'functionality', 'aws_well_architected',
+               'total', 'comments', 'submitted_at'],
+    'leaderboard': ['rank', 'team_id', 'num_scores', 'avg_presentation', 'avg_innovation', 'avg_functionality',
+                    'avg_aws_well_architected', 'avg_total']
+}
+EXPORT_PAGE_SIZE = 500
+
+# Attributes a decoded cursor must carry: the table's (string) key for scans, a row offset for the leaderboard
+EXPORT_CURSOR_KEYS = {
+    'teams': {'team_id'},
+    'scores': {'team_id', 'panelist_id'},
+    'leaderboard': {'offset'}
+}
+
+def encode_cursor(last_key):
+    """Opaque pagination cursor for a DynamoDB LastEvaluatedKey"""
+    return base64.urlsafe_b64encode(to_json(last_key).encode()).decode()
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor"""
+    return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+def csv_value(value):
+    """Flatten a DynamoDB value into a CSV cell"""
+    if isinstance(value, (list, dict, set)):
+        return to_json(value)
+    if isinstance(value, Decimal):
+        return json_default(value)
+    return value
+
+def ranked_leaderboard_page(offset, limit):
+    """One page of the leaderboard, best first, with competition ranks across every team
+    
+    Ranks need the whole leaderboard, so its rows (one per team) are read and ranked in
+    full and the page is cut by offset.
+    """
+    entries = {entry['team_id']: entry for entry in rank_leaderboard(scan_all(leaderboard_table, SCAN_SEGMENTS))}
+    ranked = RankIndex({tid: entry['avg_total'] for tid, entry in entries.items()}).ranked()
+    page = [{'rank': rank, **entries[tid]} for rank, tid, _ in ranked[offset:offset + limit]]
+    next_cursor = {'offset': offset + limit} if offset + limit < len(ranked) else None
+    return page, next_cursor
+
+def export_dataset(dataset, query):
+    """Export one page of teams, scores or the leaderboard as NDJSON or CSV (admin only)
+    
+    Teams and scores read a single scan page per call and write rows straight to the
+    output, so memory stays flat. The leaderboard is ranked across all teams on every
+    call. Clients follow X-Next-Cursor until it is absent.
+    """
+    if dataset not in EXPORT_COLUMNS:
+        return response(404, {'error': 'Unknown dataset. Use teams, scores or leaderboard'})
+    
+    export_format = query.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return response(400, {'error': 'Invalid format. Use ndjson or csv'})
+    
+    try:
+        limit = int(query.get('limit', EXPORT_PAGE_SIZE))
+        if limit < 1:
+            raise ValueError('limit must be at least 1')
+        limit = min(limit, EXPORT_PAGE_SIZE)
+        
+        cursor = decode_cursor(query['cursor']) if query.get('cursor') else None
+        if cursor is not None:
+            # A cursor of the wrong shape would otherwise reach ExclusiveStartKey and fail as a 500
+            if not isinstance(cursor, dict) or set(cursor) != EXPORT_CURSOR_KEYS[dataset]:
+                raise ValueError('cursor does not match the dataset')
+            if dataset != 'leaderboard' and not all(isinstance(value, str) for value in cursor.values()):
+                raise ValueError('cursor key values must be strings')
+        offset = cursor['offset'] if dataset == 'leaderboard' and cursor else 0
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError('offset must be a non-negative integer')
+    except (TypeError, ValueError):
+        return response(400, {'error': f'Invalid limit or cursor. limit must be an integer from 1 to {EXPORT_PAGE_SIZE}'})
+    
+    try:
+        if dataset == 'leaderboard':
+            items, next_cursor = ranked_leaderboard_page(offset, limit)
+        else:
+            # Project only the exported columns (this also keeps team passwords out)
+            table = teams_table if dataset == 'teams' else scores_table
+            columns = EXPORT_COLUMNS[dataset]
+            scan_kwargs = {
+                'Limit': limit,
+                'ProjectionExpression': ', '.join(f'#c{i}' for i in range(len(columns))),
+                'ExpressionAttributeNames': {f'#c{i}': column for i, column in enumerate(columns)}
             }
-            for i, item in enumerate(leaderboard)
-        ]
-        
-        return response(200, {
-            'team_id': team_id,
-            'position': position,
-            'total_teams': total_teams,
-            'scores': {
-                'presentation': round(avg_presentation, 2),
-                'innovation': round(avg_innovation, 2),
-                'functionality': round(avg_functionality, 2),
-                'aws_well_architected': round(avg_aws, 2),
-                'total': round(avg_total, 2)
-            },
-            'num_reviews': num_scores,
-            'feedback': feedback,
-            'leaderboard': leaderboard_with_names
-        })
+            if cursor:
+                scan_kwargs['ExclusiveStartKey'] = cursor
+            result = table.scan(**scan_kwargs)
+            items, next_cursor = result.get('Items', []), result.get('LastEvaluatedKey')
+        
+        out = io.StringIO()
+        if export_format == 'csv':
+            writer = csv.DictWriter(out, fieldnames=EXPORT_COLUMNS[dataset], extrasaction='ignore')
+            if not query.get('cursor'):
+                writer.writeheader()
+        
+        for item in items:
+            if export_format == 'csv':
+                writer.writerow({key: csv_value(value) for key, value in item.items()})
+            else:
+                out.write(to_json(item))
+                out.write('\n')
+        
+        headers = {'Content-Disposition': f'attachment; filename="{dataset}.{export_format}"'}
+        if next_cursor:
+            headers['X-Next-Cursor'] = encode_cursor(next_cursor)
+        
+        content_type = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+        return text_response(200, out.getvalue(), content_type, headers)
     except Exception as e:
         return response(500, {'error': str(e)})
 
@@ -1085,26 +1816,41 @@ def admin_delete_team(team_id):
             return response(404, {'error': 'Team not found'})
         
         team_name = result['Item'].get('team_name', team_id)
-        
-        # Delete all scores for this team
-        scores_result = scores_table.query(
-            KeyConditionExpression='team_id = :tid',
-            ExpressionAttributeValues={':tid': team_id}
-        )
-        
-        for score in scores_result.get('Items', []):
-            scores_table.delete_item(
-                Key={
-                    'team_id': team_id,
-                    'panelist_id': score['panelist_id']
-                }
-            )
+        started = time.perf_counter()
+        
+        # Delete all scores for this team, one page of keys at a time
+        deleted_scores = 0
+        query_kwargs = {
+            'KeyConditionExpression': 'team_id = :tid',
+            'ExpressionAttributeValues': {':tid': team_id},
+            'ProjectionExpression': 'team_id, panelist_id'
+        }
+        while True:
+            scores_result = scores_table.query(**query_kwargs)
+            deleted_scores += batch_delete_items(scores_table, scores_result.get('Items', []))
+            if 'LastEvaluatedKey' not in scores_result:
+                break
+            query_kwargs['ExclusiveStartKey'] = scores_result['LastEvaluatedKey']
         
         # Delete the team
         teams_table.delete_item(Key={'team_id': team_id})
         
+        # A frozen results snapshot still ranks the deleted team, so rebuild it
+        criteria = judging_criteria_table.get_item(Key={'criteria_id': 'main'}).get('Item', {})
+        if criteria.get('results_snapshot_id'):
+            try:
+                create_results_snapshot()
+            except Exception as e:
+                print(f"Results snapshot rebuild failed: {e}")
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"Deleted team {team_id}: {deleted_scores} scores + team item in {elapsed_ms:.1f}ms")
+        
         return response(200, {
-            'message': f'Team "{team_name}" and all associated scores deleted successfully'
+            'message': f'Team "{team_name}" and all associated scores deleted successfully',
+            'deleted_scores': deleted_scores,
+            'deleted_items': deleted_scores + 1,
+            'elapsed_ms': round(elapsed_ms, 1)
         })
     except Exception as e:
         return response(500, {'error': str(e)})
@@ -1139,8 +1885,7 @@ def admin_reset_panelist_password(panelist_id, body):
 def get_all_panelists():
     """Get all panelists (admin only)"""
     try:
-        result = panelists_table.scan()
-        panelists = result.get('Items', [])
+        panelists = scan_all(panelists_table)
         
         # Remove passwords from response
         for panelist in panelists:
@@ -1221,3 +1966,6 @@ def toggle_panelist_admin(panelist_id, current_admin_id):
         })
     except Exception as e:
         return response(500, {'error': str(e)})
+
+cold_start = True
+IMPORT_MS = (time.perf_counter() - IMPORT_STARTED) * 1000
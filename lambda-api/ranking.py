@@ -0,0 +1,57 @@
+from bisect import bisect_left, insort
+
+class RankIndex:
+    """Teams ordered by score, best first, with competition ranks (tied teams share a rank, then a gap: 1, 2, 2, 4)
+    
+    Entries live in a sorted list of (-score, team_id), so rank lookups are a bisect
+    and updates are a bisect plus one list insert/delete.
+    """
+    
+    def __init__(self, scores=None):
+        self._scores = dict(scores or {})
+        self._entries = sorted((-score, team_id) for team_id, score in self._scores.items())
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __contains__(self, team_id):
+        return team_id in self._scores
+    
+    def score(self, team_id):
+        """Current score of a team, or None if it is not ranked"""
+        return self._scores.get(team_id)
+    
+    def update(self, team_id, score):
+        """Add a team or move it to a new score"""
+        self.remove(team_id)
+        self._scores[team_id] = score
+        insort(self._entries, (-score, team_id))
+    
+    def remove(self, team_id):
+        """Drop a team from the ranking, if present"""
+        score = self._scores.pop(team_id, None)
+        if score is not None:
+            del self._entries[bisect_left(self._entries, (-score, team_id))]
+    
+    def rank(self, team_id):
+        """Competition rank of a team (1 + the number of teams scoring strictly higher), or None"""
+        score = self._scores.get(team_id)
+        if score is None:
+            return None
+        # (-score,) sorts before every (-score, team_id), so this counts the strictly better teams
+        return bisect_left(self._entries, (-score,)) + 1
+    
+    def top_k(self, k):
+        """The best k teams as (rank, team_id, score) tuples"""
+        ranked = []
+        for i, (negated, team_id) in enumerate(self._entries[:k]):
+            if ranked and ranked[-1][2] == -negated:
+                rank = ranked[-1][0]  # Tied with the team above
+            else:
+                rank = i + 1
+            ranked.append((rank, team_id, -negated))
+        return ranked
+    
+    def ranked(self):
+        """Every team as (rank, team_id, score), best first"""
+        return self.top_k(len(self._entries))
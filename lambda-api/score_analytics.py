@@ -0,0 +1,82 @@
+from math import sqrt
+from operator import itemgetter
+
+from ranking import RankIndex
+
+CATEGORIES = ['presentation', 'innovation', 'functionality', 'aws_well_architected']
+category_values = itemgetter(*CATEGORIES)
+
+def analyze_scores(scores, teams):
+    """Category means, variance, judge-normalized scores and per-use-case rankings for every scored team
+    
+    Each panelist's totals are converted to z-scores against that panelist's own mean and
+    spread, so a harsh or lenient judge moves every team they scored equally. A team's
+    normalized score is the mean of its z-scores. Variances and spreads are population ones.
+    """
+    # One pass over the rows, converting each Decimal once
+    team_totals = {}  # team_id -> [(panelist_id, total)]
+    team_values = {}  # team_id -> [category values per score]
+    panelist_totals = {}  # panelist_id -> [total]
+    for score in scores:
+        values = tuple(map(float, category_values(score)))
+        total = sum(values)
+        team_id = score['team_id']
+        if team_id not in team_totals:
+            team_totals[team_id] = []
+            team_values[team_id] = []
+        team_totals[team_id].append((score['panelist_id'], total))
+        team_values[team_id].append(values)
+        panelist_totals.setdefault(score['panelist_id'], []).append(total)
+    
+    # Per panelist: mean and spread of the totals they gave
+    panelist_stats = {}
+    for panelist_id, totals in panelist_totals.items():
+        mean = sum(totals) / len(totals)
+        panelist_stats[panelist_id] = (mean, sqrt(sum((t - mean) ** 2 for t in totals) / len(totals)))
+    
+    names = {t['team_id']: t.get('team_name', t['team_id']) for t in teams}
+    use_case_of = {t['team_id']: int(t.get('use_case') or 0) for t in teams}
+    
+    team_rows = []
+    for team_id, scored in team_totals.items():
+        n = len(scored)
+        avg_total = sum(total for _, total in scored) / n
+        # A judge who gave every team the same total carries no ranking signal, so their z-scores are 0
+        z_scores = []
+        for panelist_id, total in scored:
+            mean, std = panelist_stats[panelist_id]
+            z_scores.append((total - mean) / std if std > 0 else 0.0)
+        team_rows.append({
+            'team_id': team_id,
+            'team_name': names.get(team_id, team_id),
+            'use_case': use_case_of.get(team_id, 0),
+            'num_scores': n,
+            'category_means': {category: round(sum(column) / n, 3) for category, column in zip(CATEGORIES, zip(*team_values[team_id]))},
+            'avg_total': round(avg_total, 3),
+            'total_variance': round(sum((total - avg_total) ** 2 for _, total in scored) / n, 3),
+            'normalized_score': round(sum(z_scores) / n, 3)
+        })
+    
+    # Rankings within each use case, on raw and normalized scores (rounded, so float noise can't split ties)
+    by_use_case = {}
+    for row in team_rows:
+        by_use_case.setdefault(row['use_case'], []).append(row)
+    for rows in by_use_case.values():
+        raw = RankIndex({row['team_id']: row['avg_total'] for row in rows})
+        normalized = RankIndex({row['team_id']: row['normalized_score'] for row in rows})
+        for row in rows:
+            row['use_case_rank'] = raw.rank(row['team_id'])
+            row['normalized_use_case_rank'] = normalized.rank(row['team_id'])
+    team_rows.sort(key=lambda row: (row['use_case'], row['normalized_use_case_rank'], row['team_id']))
+    
+    panelist_rows = [
+        {
+            'panelist_id': panelist_id,
+            'num_scores': len(panelist_totals[panelist_id]),
+            'mean_total': round(mean, 3),
+            'std_total': round(std, 3)
+        }
+        for panelist_id, (mean, std) in sorted(panelist_stats.items())
+    ]
+    
+    return {'categories': CATEGORIES, 'teams': team_rows, 'panelists': panelist_rows}
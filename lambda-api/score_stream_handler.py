@@ -0,0 +1,140 @@
+import boto3
+import sys
+import time
+from decimal import Decimal
+
+from change_log import change_entry, record_changes
+
+dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+scores_table = dynamodb.Table('aais-hackathon-scores')
+leaderboard_table = dynamodb.Table('aais-hackathon-leaderboard')
+
+# Applied stream eventIDs (shared with stream_handler, prefixed), so a redelivered record is never counted twice
+dedupe_table = dynamodb.Table('aais-hackathon-stream-dedupe')
+DEDUPE_TTL_SECONDS = 2 * 86400  # Longer than the 24h stream retention
+
+SCORE_FIELDS = ['presentation', 'innovation', 'functionality', 'aws_well_architected', 'total']
+
+def lambda_handler(event, context):
+    """Process scores table DynamoDB Stream events and maintain the leaderboard
+
+    Returns batchItemFailures so Lambda only retries records that were not applied
+    (requires ReportBatchItemFailures on the event source mapping).
+    """
+
+    # If logging fails the whole batch is retried; the leaderboard updates below are deduped per eventID
+    record_changes([change_entry('scores', record) for record in event.get('Records', [])])
+
+    failed_records = []
+    for record in event.get('Records', []):
+        event_name = record.get('eventName')
+        images = record.get('dynamodb', {})
+
+        try:
+            if event_name == 'INSERT':
+                apply_score_delta(record['eventID'], images.get('NewImage', {}), None)
+            elif event_name == 'MODIFY':
+                apply_score_delta(record['eventID'], images.get('NewImage', {}), images.get('OldImage', {}))
+            elif event_name == 'REMOVE':
+                apply_score_delta(record['eventID'], None, images.get('OldImage', {}))
+        except Exception as e:
+            print(f"Error applying event {record.get('eventID')}: {e}")
+            failed_records.append(record)
+
+    return {'batchItemFailures': [{'itemIdentifier': r['dynamodb']['SequenceNumber']} for r in failed_records]}
+
+def score_values(image):
+    """Read the numeric score fields from a stream image"""
+    return {field: Decimal(image.get(field, {}).get('N', '0')) for field in SCORE_FIELDS}
+
+def apply_score_delta(event_id, new_image, old_image):
+    """Add the difference between two versions of a score to its team's running sums, once per stream event"""
+    image = new_image or old_image
+    team_id = image.get('team_id', {}).get('S')
+    if not team_id:
+        return
+
+    new_values = score_values(new_image) if new_image else None
+    old_values = score_values(old_image) if old_image else None
+
+    count_delta = (1 if new_values else 0) - (1 if old_values else 0)
+    sum_deltas = {
+        field: (new_values[field] if new_values else 0) - (old_values[field] if old_values else 0)
+        for field in SCORE_FIELDS
+    }
+
+    if count_delta == 0 and not any(sum_deltas.values()):
+        return  # Only comments changed
+
+    add_expr = ['num_scores :n']
+    expr_values = {':n': count_delta}
+    for field, delta in sum_deltas.items():
+        add_expr.append(f'sum_{field} :{field}')
+        expr_values[f':{field}'] = delta
+
+    # The ADD and the eventID marker commit together: a retried record finds the marker and is skipped
+    client = leaderboard_table.meta.client
+    try:
+        client.transact_write_items(TransactItems=[
+            {'Put': {
+                'TableName': dedupe_table.name,
+                'Item': {
+                    'event_id': f'leaderboard#{event_id}',
+                    'status': 'applied',
+                    'expires_at': int(time.time()) + DEDUPE_TTL_SECONDS
+                },
+                'ConditionExpression': 'attribute_not_exists(event_id)'
+            }},
+            {'Update': {
+                'TableName': leaderboard_table.name,
+                'Key': {'team_id': team_id},
+                'UpdateExpression': 'ADD ' + ', '.join(add_expr),
+                'ExpressionAttributeValues': expr_values
+            }}
+        ])
+    except client.exceptions.TransactionCanceledException as e:
+        reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+        if reasons[0:1] == ['ConditionalCheckFailed']:
+            print(f"Skipping already applied event {event_id}")
+            return
+        raise
+    print(f"Leaderboard updated for {team_id}: count {count_delta:+d}, total {sum_deltas['total']:+}")
+
+def rebuild_leaderboard():
+    """Recompute every leaderboard row from the scores table (backfill or repair)"""
+    totals = {}
+    scan_kwargs = {}
+    while True:
+        result = scores_table.scan(**scan_kwargs)
+        for score in result.get('Items', []):
+            row = totals.setdefault(score['team_id'], {f'sum_{field}': Decimal(0) for field in SCORE_FIELDS})
+            row['num_scores'] = row.get('num_scores', 0) + 1
+            for field in SCORE_FIELDS:
+                row[f'sum_{field}'] += score.get(field, 0)
+        if 'LastEvaluatedKey' not in result:
+            break
+        scan_kwargs['ExclusiveStartKey'] = result['LastEvaluatedKey']
+
+    # Rows for teams that no longer have any scores would otherwise keep their stale sums
+    stale = []
+    scan_kwargs = {'ProjectionExpression': 'team_id'}
+    while True:
+        result = leaderboard_table.scan(**scan_kwargs)
+        stale.extend(row['team_id'] for row in result.get('Items', []) if row['team_id'] not in totals)
+        if 'LastEvaluatedKey' not in result:
+            break
+        scan_kwargs['ExclusiveStartKey'] = result['LastEvaluatedKey']
+
+    with leaderboard_table.batch_writer(overwrite_by_pkeys=['team_id']) as batch:
+        for team_id, row in totals.items():
+            batch.put_item(Item={'team_id': team_id, **row})
+        for team_id in stale:
+            batch.delete_item(Key={'team_id': team_id})
+
+    print(f"Leaderboard rebuilt for {len(totals)} teams, removed {len(stale)} stale rows")
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--rebuild']:
+        rebuild_leaderboard()
+    else:
+        print("Usage: python3 score_stream_handler.py --rebuild")
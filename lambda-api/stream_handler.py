@@ -1,10 +1,33 @@
 import json
 import boto3
 import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from change_log import change_entry, record_changes
 
 sns = boto3.client('sns', region_name='us-east-1')
 SNS_TOPIC_ARN = os.environ.get('SNS_TOPIC_ARN', 'arn:aws:sns:us-east-1:031421429609:aais-hackathon-notifications')
 
+# Delivered stream eventIDs, so retried records are never notified twice
+dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+dedupe_table = dynamodb.Table('aais-hackathon-stream-dedupe')
+DEDUPE_TTL_SECONDS = 2 * 86400  # Longer than the 24h stream retention
+CLAIM_TIMEOUT_SECONDS = 300  # A pending claim older than this belongs to a crashed invocation
+
+# Digest mode sends one notification per type for the whole stream batch instead of one per record.
+# Widen the batch with the event source mapping's MaximumBatchingWindowInSeconds.
+NOTIFICATION_DIGEST = os.environ.get('NOTIFICATION_DIGEST', 'false').lower() == 'true'
+PUBLISH_CONCURRENCY = int(os.environ.get('PUBLISH_CONCURRENCY', '4'))
+
+# Team updates are held per team until it stops editing for the quiet period, then sent as one
+# consolidated update. A scheduled invocation flushes them; 0 sends every update immediately.
+TEAM_UPDATE_QUIET_SECONDS = int(os.environ.get('TEAM_UPDATE_QUIET_SECONDS', '0'))
+TEAM_UPDATE_MAX_DELAY_SECONDS = int(os.environ.get('TEAM_UPDATE_MAX_DELAY_SECONDS', '900'))  # Cap for teams that never go quiet
+notification_state_table = dynamodb.Table('aais-hackathon-notification-state')
+STATE_TTL_SECONDS = 86400
+
 USE_CASES = {
     1: "Vault-Tec Corporation [Secrecy-Driven]",
     2: "RobCo Industries [Speed-Driven]",
@@ -14,110 +37,429 @@ USE_CASES = {
     6: "Nuka-Cola Corporation [Flexibility-Driven]"
 }
 
+# Banner title, digest subject and digest title per notification type
+NOTIFICATION_TYPES = {
+    'new_team': ('NEW TEAM REGISTRATION', "🎮 {count} New Teams Registered", 'NEW TEAM REGISTRATIONS'),
+    'team_update': ('TEAM UPDATE', "📝 {count} Team Updates", 'TEAM UPDATES')
+}
+
 def lambda_handler(event, context):
-    """Process DynamoDB Stream events and send SNS notifications"""
+    """Process DynamoDB Stream events and send SNS notifications
+    
+    Returns batchItemFailures so Lambda only retries records whose notification
+    was not delivered (requires ReportBatchItemFailures on the event source mapping).
+    Invocations without Records (the EventBridge schedule) only flush pending team updates.
+    """
+    
+    if 'Records' not in event:
+        with ThreadPoolExecutor(max_workers=PUBLISH_CONCURRENCY) as pool:
+            publish_notifications(pool, collect_team_updates())
+        return {'statusCode': 200}
     
-    for record in event.get('Records', []):
+    # Log every change first; delta clients re-read a window behind their cursor,
+    # so a notification failure later in the batch can't hide a change from them
+    record_changes([change_entry('teams', record) for record in event['Records']])
+    
+    notifications = []
+    for record in event['Records']:
         event_name = record.get('eventName')
         
+        notification = None
         if event_name == 'INSERT':
-            handle_new_team(record)
+            notification = handle_new_team(record)
         elif event_name == 'MODIFY':
-            handle_team_update(record)
+            notification = handle_team_update(record)
+        
+        if notification:
+            notification['records'] = [record]
+            notification['states'] = []
+            notifications.append(notification)
+    
+    failed_records = []
+    with ThreadPoolExecutor(max_workers=PUBLISH_CONCURRENCY) as pool:
+        # Claim each record's eventID; records a previous attempt already delivered are skipped
+        claimed = []
+        for notification, status in zip(notifications, pool.map(lambda n: claim_event(n['records'][0]), notifications)):
+            if status == 'claimed':
+                claimed.append(notification)
+            elif status == 'error':
+                failed_records.extend(notification['records'])
+        
+        to_publish = []
+        pending_updates = {}
+        for notification in claimed:
+            if notification['type'] == 'team_update' and TEAM_UPDATE_QUIET_SECONDS > 0:
+                team_id = notification['records'][0]['dynamodb']['NewImage']['team_id']['S']
+                pending_updates.setdefault(team_id, []).extend(notification['records'])
+            else:
+                to_publish.append(notification)
+        
+        # One state write per team, so a team's records can't be applied out of order
+        for records, stored in zip(pending_updates.values(), pool.map(buffer_team_update, pending_updates.values())):
+            if stored:
+                list(pool.map(mark_delivered, records))
+            else:
+                list(pool.map(release_claim, records))
+                failed_records.extend(records)
+        
+        if TEAM_UPDATE_QUIET_SECONDS > 0:
+            to_publish.extend(collect_team_updates())
+        failed_records.extend(publish_notifications(pool, to_publish))
+    
+    print(f"Processed {len(event['Records'])} records: {len(notifications) - len(claimed)} duplicates skipped, "
+          f"{len(pending_updates)} team updates held, {len(failed_records)} failed")
+    
+    return {'batchItemFailures': [{'itemIdentifier': r['dynamodb']['SequenceNumber']} for r in failed_records]}
+
+def publish_notifications(pool, notifications):
+    """Publish notifications and settle their claims; returns the stream records behind failed publishes"""
+    if not notifications:
+        return []
+    
+    messages = build_digests(notifications) if NOTIFICATION_DIGEST else [
+        {
+            'subject': n['subject'],
+            'message': format_message(NOTIFICATION_TYPES[n['type']][0], n['body']),
+            'records': n['records'],
+            'states': n['states']
+        }
+        for n in notifications
+    ]
+    
+    started = time.perf_counter()
+    results = list(pool.map(lambda m: send_notification(m['subject'], m['message']), messages))
+    publish_ms = (time.perf_counter() - started) * 1000
+    
+    failed_records = []
+    for message, delivered in zip(messages, results):
+        if delivered:
+            list(pool.map(mark_delivered, message['records']))
+        else:
+            list(pool.map(release_claim, message['records']))
+            list(pool.map(restore_team_state, message['states']))
+            failed_records.extend(message['records'])
+    
+    print(f"Published {results.count(True)}/{len(messages)} notifications in {publish_ms:.1f}ms (digest={NOTIFICATION_DIGEST})")
+    return failed_records
+
+def claim_event(record):
+    """Claim a stream record for delivery; returns 'claimed', 'duplicate' or 'error'"""
+    now = int(time.time())
+    try:
+        dedupe_table.put_item(
+            Item={
+                'event_id': record['eventID'],
+                'status': 'pending',
+                'claimed_at': now,
+                'expires_at': now + DEDUPE_TTL_SECONDS
+            },
+            ConditionExpression='attribute_not_exists(event_id) OR (#s = :pending AND claimed_at < :stale)',
+            ExpressionAttributeNames={'#s': 'status'},
+            ExpressionAttributeValues={':pending': 'pending', ':stale': now - CLAIM_TIMEOUT_SECONDS},
+            ReturnValuesOnConditionCheckFailure='ALL_OLD'
+        )
+        return 'claimed'
+    except dedupe_table.meta.client.exceptions.ConditionalCheckFailedException as e:
+        # The old item comes back in wire format. Only a sent notification is a duplicate: a fresh
+        # pending claim may belong to an invocation that died before publishing, so retry the record
+        if e.response.get('Item', {}).get('status', {}).get('S') == 'sent':
+            print(f"Skipping already delivered event {record['eventID']}")
+            return 'duplicate'
+        print(f"Event {record['eventID']} is claimed by another attempt, retrying later")
+        return 'error'
+    except Exception as e:
+        print(f"Error claiming event {record.get('eventID')}: {e}")
+        return 'error'
+
+def mark_delivered(record):
+    """Record that a claimed event's notification went out"""
+    try:
+        dedupe_table.update_item(
+            Key={'event_id': record['eventID']},
+            UpdateExpression='SET #s = :sent',
+            ExpressionAttributeNames={'#s': 'status'},
+            ExpressionAttributeValues={':sent': 'sent'}
+        )
+    except Exception as e:
+        # The pending claim still blocks duplicates until it goes stale
+        print(f"Error marking event {record['eventID']} delivered: {e}")
+
+def release_claim(record):
+    """Drop a claim after a failed publish so the retry can deliver it"""
+    try:
+        dedupe_table.delete_item(Key={'event_id': record['eventID']})
+    except Exception as e:
+        print(f"Error releasing event {record['eventID']}: {e}")
+
+# Team update coalescing
+
+def buffer_team_update(records):
+    """Fold one team's MODIFY records into its pending update; returns whether it was stored"""
+    old_image = records[0]['dynamodb'].get('OldImage', {})
+    new_image = records[-1]['dynamodb']['NewImage']
+    now = int(time.time())
+    try:
+        notification_state_table.update_item(
+            Key={'team_id': new_image['team_id']['S']},
+            UpdateExpression='SET baseline = if_not_exists(baseline, :old), latest = :new, '
+                             'first_change_at = if_not_exists(first_change_at, :now), last_change_at = :now, expires_at = :ttl '
+                             'ADD version :one',  # Bumped on every edit, so a flush can tell it read the newest state
+            ExpressionAttributeValues={
+                ':old': json.dumps(old_image),
+                ':new': json.dumps(new_image),
+                ':now': now,
+                ':ttl': now + STATE_TTL_SECONDS,
+                ':one': 1
+            }
+        )
+        return True
+    except Exception as e:
+        print(f"Error buffering update for {new_image.get('team_id')}: {e}")
+        return False
+
+def collect_team_updates():
+    """Take the pending team updates whose quiet period has passed and build their notifications"""
+    now = int(time.time())
+    scan_kwargs = {
+        'FilterExpression': 'last_change_at <= :quiet OR first_change_at <= :overdue',
+        'ExpressionAttributeValues': {
+            ':quiet': now - TEAM_UPDATE_QUIET_SECONDS,
+            ':overdue': now - TEAM_UPDATE_MAX_DELAY_SECONDS
+        }
+    }
+    due = []
+    while True:
+        result = notification_state_table.scan(**scan_kwargs)
+        due.extend(result.get('Items', []))
+        if 'LastEvaluatedKey' not in result:
+            break
+        scan_kwargs['ExclusiveStartKey'] = result['LastEvaluatedKey']
     
-    return {'statusCode': 200}
+    notifications = []
+    for state in due:
+        try:
+            # Only take the state as read; if the team edited again since (even in the same second), it is flushed later
+            notification_state_table.delete_item(
+                Key={'team_id': state['team_id']},
+                ConditionExpression='version = :seen',
+                ExpressionAttributeValues={':seen': state['version']}
+            )
+        except notification_state_table.meta.client.exceptions.ConditionalCheckFailedException:
+            continue
+        except Exception as e:
+            print(f"Error flushing update for {state['team_id']}: {e}")
+            continue
+        
+        notification = team_update_notification(json.loads(state['baseline']), json.loads(state['latest']))
+        if notification:  # Edits that cancelled each other out send nothing
+            notification['records'] = []
+            notification['states'] = [state]
+            notifications.append(notification)
+    
+    if due:
+        print(f"Flushed {len(notifications)} coalesced team updates from {len(due)} pending teams")
+    return notifications
+
+def restore_team_state(state):
+    """Put a flushed team update back after a failed publish, merged with any newer edits"""
+    try:
+        notification_state_table.update_item(
+            Key={'team_id': state['team_id']},
+            UpdateExpression='SET baseline = :baseline, latest = if_not_exists(latest, :latest), '
+                             'first_change_at = :first, last_change_at = if_not_exists(last_change_at, :last), '
+                             'version = if_not_exists(version, :version), expires_at = :ttl',
+            ExpressionAttributeValues={
+                ':baseline': state['baseline'],
+                ':latest': state['latest'],
+                ':first': state['first_change_at'],
+                ':last': state['last_change_at'],
+                ':version': state['version'],
+                ':ttl': int(time.time()) + STATE_TTL_SECONDS
+            }
+        )
+    except Exception as e:
+        print(f"Error restoring update for {state['team_id']}: {e}")
 
 def handle_new_team(record):
     """Handle new team registration"""
-    new_image = record.get('dynamodb', {}).get('NewImage', {})
+    team = deserialize_image(record.get('dynamodb', {}).get('NewImage', {}))
     
-    team_id = new_image.get('team_id', {}).get('S', 'Unknown')
-    team_name = new_image.get('team_name', {}).get('S', team_id)
-    created_at = new_image.get('created_at', {}).get('S', '')
+    team_id = team.get('team_id', 'Unknown')
+    team_name = team.get('team_name', team_id)
+    created_at = team.get('created_at', '')
     
-    subject = f"🎮 New Team Registered: {team_name}"
-    message = f"""
-═══════════════════════════════════════════════════
-    AAIS 2026 EUC HACKATHON - NEW TEAM REGISTRATION
-═══════════════════════════════════════════════════
-
-A new team has joined the hackathon!
+    body = f"""A new team has joined the hackathon!
 
 Team Name: {team_name}
 Team ID: {team_id}
 Registered: {created_at}
 
-The team has not yet selected a use case.
-
-───────────────────────────────────────────────────
-View all teams at: https://aais2026euchackathon.com/login.html
-═══════════════════════════════════════════════════
-"""
+The team has not yet selected a use case."""
     
-    send_notification(subject, message)
+    return {'type': 'new_team', 'subject': f"🎮 New Team Registered: {team_name}", 'body': body}
 
 def handle_team_update(record):
     """Handle team updates"""
-    old_image = record.get('dynamodb', {}).get('OldImage', {})
-    new_image = record.get('dynamodb', {}).get('NewImage', {})
+    images = record.get('dynamodb', {})
+    return team_update_notification(images.get('OldImage', {}), images.get('NewImage', {}))
+
+def team_update_notification(old_image, new_image):
+    """Build the update notification between two versions of a team, or None"""
+    changes = diff_images(old_image, new_image)
+    if not changes:
+        return None  # Only bookkeeping fields changed
     
-    team_id = new_image.get('team_id', {}).get('S', 'Unknown')
-    team_name = new_image.get('team_name', {}).get('S', team_id)
+    team_id = deserialize(new_image['team_id']) if 'team_id' in new_image else 'Unknown'
+    team_name = deserialize(new_image['team_name']) if 'team_name' in new_image else team_id
     
-    changes = []
+    lines = describe_changes(changes)
+    if not lines:
+        return None  # No significant changes to report
+    
+    body = f"""Team "{team_name}" has updated their submission:
+
+{chr(10).join(lines)}"""
+    
+    return {'type': 'team_update', 'subject': f"📝 Team Update: {team_name}", 'body': body}
+
+def describe_changes(changes):
+    """Render the notification bullet points for a team's field changes"""
+    by_field = {change.field: change for change in changes}
+    lines = []
     
     # Check use case change
-    old_use_case = int(old_image.get('use_case', {}).get('N', 0))
-    new_use_case = int(new_image.get('use_case', {}).get('N', 0))
-    if old_use_case != new_use_case and new_use_case > 0:
-        use_case_name = USE_CASES.get(new_use_case, f"Use Case {new_use_case}")
-        changes.append(f"• Selected Use Case: {use_case_name}")
-    
-    # Check members change
-    old_members = old_image.get('members', {}).get('L', [])
-    new_members = new_image.get('members', {}).get('L', [])
-    if len(new_members) != len(old_members):
-        member_names = [m.get('M', {}).get('name', {}).get('S', '') for m in new_members if m.get('M', {}).get('name', {}).get('S')]
+    change = by_field.get('use_case')
+    if change and change.new:
+        use_case_name = USE_CASES.get(change.new, f"Use Case {change.new}")
+        lines.append(f"• Selected Use Case: {use_case_name}")
+    
+    # Check members change (compares every member, so renames are caught too)
+    change = by_field.get('members')
+    if change:
+        member_names = [m.get('name') for m in change.new or [] if isinstance(m, dict) and m.get('name')]
         if member_names:
-            changes.append(f"• Team Members ({len(member_names)}): {', '.join(member_names)}")
+            lines.append(f"• Team Members ({len(member_names)}): {', '.join(member_names)}")
     
     # Check solution description change
-    old_solution = old_image.get('solution_description', {}).get('S', '')
-    new_solution = new_image.get('solution_description', {}).get('S', '')
-    if new_solution and new_solution != old_solution:
-        preview = new_solution[:150] + '...' if len(new_solution) > 150 else new_solution
-        changes.append(f"• Solution Description Updated:\n    \"{preview}\"")
+    change = by_field.get('solution_description')
+    if change and change.new:
+        preview = change.new[:150] + '...' if len(change.new) > 150 else change.new
+        lines.append(f"• Solution Description Updated:\n    \"{preview}\"")
     
     # Check services change
-    old_services = old_image.get('services_used', {}).get('L', [])
-    new_services = new_image.get('services_used', {}).get('L', [])
-    if len(new_services) != len(old_services):
-        service_names = [s.get('S', '') for s in new_services if s.get('S')]
+    change = by_field.get('services_used')
+    if change:
+        service_names = [s for s in change.new or [] if s]
         if service_names:
-            changes.append(f"• AWS Services ({len(service_names)}): {', '.join(service_names)}")
+            lines.append(f"• AWS Services ({len(service_names)}): {', '.join(service_names)}")
     
-    if not changes:
-        return  # No significant changes to report
+    return lines
+
+# Stream image decoding and diffing
+
+FieldChange = namedtuple('FieldChange', ['field', 'kind', 'old', 'new'])  # kind: added, removed or modified
+
+DIFF_IGNORED_FIELDS = {'updated_at'}  # Touched by every update_team call
+
+def decode_number(raw):
+    """Decode a wire-format number as int when it is integral"""
+    return float(raw) if '.' in raw or 'e' in raw or 'E' in raw else int(raw)
+
+DECODERS = {
+    'S': lambda v: v,
+    'N': decode_number,
+    'BOOL': lambda v: v,
+    'NULL': lambda v: None,
+    'B': lambda v: v,  # Stays base64 encoded
+    'L': lambda v: [deserialize(item) for item in v],
+    'M': lambda v: {key: deserialize(item) for key, item in v.items()},
+    'SS': set,
+    'NS': lambda v: {decode_number(n) for n in v},
+    'BS': set
+}
+
+def deserialize(value):
+    """Decode one DynamoDB JSON attribute value into plain Python"""
+    # Strings and maps (members) make up most of a team record, so they skip the decoder lookup
+    if 'S' in value:
+        return value['S']
+    if 'M' in value:
+        return {key: deserialize(item) for key, item in value['M'].items()}
+    for type_code, raw in value.items():
+        return DECODERS[type_code](raw)
+    return None
+
+def deserialize_image(image):
+    """Decode a whole stream image"""
+    return {field: deserialize(value) for field, value in image.items()}
+
+def diff_images(old_image, new_image):
+    """Field-level changes between two stream images
     
-    subject = f"📝 Team Update: {team_name}"
-    message = f"""
+    Unchanged fields are skipped on the raw wire dicts, so only changed
+    attributes are ever decoded.
+    """
+    changes = []
+    for field in old_image.keys() | new_image.keys():
+        if field in DIFF_IGNORED_FIELDS:
+            continue
+        old_raw = old_image.get(field)
+        new_raw = new_image.get(field)
+        if old_raw == new_raw:
+            continue
+        if old_raw is None:
+            changes.append(FieldChange(field, 'added', None, deserialize(new_raw)))
+        elif new_raw is None:
+            changes.append(FieldChange(field, 'removed', deserialize(old_raw), None))
+        else:
+            changes.append(FieldChange(field, 'modified', deserialize(old_raw), deserialize(new_raw)))
+    return changes
+
+def build_digests(notifications):
+    """Merge notifications into one message per type, keeping their source records and states"""
+    by_type = {}
+    for notification in notifications:
+        by_type.setdefault(notification['type'], []).append(notification)
+    
+    messages = []
+    for notification_type, group in by_type.items():
+        title, digest_subject, digest_title = NOTIFICATION_TYPES[notification_type]
+        records = [record for n in group for record in n['records']]
+        states = [state for n in group for state in n['states']]
+        if len(group) == 1:
+            messages.append({
+                'subject': group[0]['subject'],
+                'message': format_message(title, group[0]['body']),
+                'records': records,
+                'states': states
+            })
+            continue
+        separator = "\n\n───────────────────────────────────────────────────\n\n"
+        body = separator.join(n['body'] for n in group)
+        messages.append({
+            'subject': digest_subject.format(count=len(group)),
+            'message': format_message(f"{digest_title} ({len(group)})", body),
+            'records': records,
+            'states': states
+        })
+    return messages
+
+def format_message(title, body):
+    """Wrap a notification body in the standard banner and footer"""
+    return f"""
 ═══════════════════════════════════════════════════
-    AAIS 2026 EUC HACKATHON - TEAM UPDATE
+    AAIS 2026 EUC HACKATHON - {title}
 ═══════════════════════════════════════════════════
 
-Team "{team_name}" has updated their submission:
-
-{chr(10).join(changes)}
+{body}
 
 ───────────────────────────────────────────────────
 View all teams at: https://aais2026euchackathon.com/login.html
 ═══════════════════════════════════════════════════
 """
-    
-    send_notification(subject, message)
 
 def send_notification(subject, message):
-    """Send SNS notification"""
+    """Send SNS notification, returning whether it was accepted"""
     try:
         sns.publish(
             TopicArn=SNS_TOPIC_ARN,
@@ -125,5 +467,7 @@ def send_notification(subject, message):
             Message=message
         )
         print(f"Notification sent: {subject}")
+        return True
     except Exception as e:
         print(f"Error sending notification: {e}")
+        return False
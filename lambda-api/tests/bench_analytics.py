@@ -0,0 +1,63 @@
+"""Benchmark: score_analytics.analyze_scores against the old per-category averaging loops
+
+    python3 tests/bench_analytics.py [--teams 5000] [--panelists 50] [--runs 5]
+
+Every panelist scores every team, with Decimal values as DynamoDB returns them.
+  legacy loops   the old get_all_scores aggregation: group rows by team, then one sum()
+                 generator pass per category (means only, on Decimals)
+  analyze_scores category means plus variance, per-panelist z-scores and per-use-case ranks
+"""
+import argparse
+import random
+from decimal import Decimal
+
+import conftest  # Puts lambda-api on sys.path
+from conftest import median_ms
+from score_analytics import analyze_scores
+
+def legacy_averages(scores):
+    """The old get_all_scores aggregation, without the response"""
+    team_scores = {}
+    for score in scores:
+        team_scores.setdefault(score['team_id'], []).append(score)
+    averages = {}
+    for team_id, rows in team_scores.items():
+        n = len(rows)
+        averages[team_id] = {
+            'avg_presentation': sum(s['presentation'] for s in rows) / n,
+            'avg_innovation': sum(s['innovation'] for s in rows) / n,
+            'avg_functionality': sum(s['functionality'] for s in rows) / n,
+            'avg_aws_well_architected': sum(s['aws_well_architected'] for s in rows) / n,
+            'avg_total': sum(s['total'] for s in rows) / n
+        }
+    return sorted(averages.items(), key=lambda item: item[1]['avg_total'], reverse=True)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--teams', type=int, default=5000)
+    parser.add_argument('--panelists', type=int, default=50)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    scores = []
+    for t in range(args.teams):
+        for p in range(args.panelists):
+            values = [Decimal(rng.randint(1, 5)) for _ in range(4)]
+            scores.append({
+                'team_id': f'team-{t}', 'panelist_id': f'panelist-{p}', 'presentation': values[0], 'innovation': values[1],
+                'functionality': values[2], 'aws_well_architected': values[3], 'total': sum(values)
+            })
+    teams = [{'team_id': f'team-{t}', 'use_case': Decimal(t % 6 + 1)} for t in range(args.teams)]
+    
+    # Same means either way
+    legacy = dict(legacy_averages(scores))
+    for row in analyze_scores(scores, teams)['teams'][:50]:
+        assert abs(float(legacy[row['team_id']]['avg_total']) - row['avg_total']) < 0.001
+    
+    print(f"{args.teams} teams x {args.panelists} panelists ({len(scores)} scores), median of {args.runs} (ms)")
+    print(f"  legacy loops (means only)       {median_ms(lambda: legacy_averages(scores), args.runs):8.1f}")
+    print(f"  analyze_scores (full analytics) {median_ms(lambda: analyze_scores(scores, teams), args.runs):8.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark: Lambda cold start with eager versus lazily built AWS clients
+
+    python3 tests/bench_coldstart.py [--runs 7]
+
+Each sample is a fresh Python process, timed from just before `import lambda_function`
+to the end of its first request:
+  eager    the old module setup: import boto3 and build the DynamoDB resource and the
+           Bedrock client at import, then serve OPTIONS
+  lazy     the current module, serving OPTIONS (no AWS client is ever built)
+  lazy+db  the current module, building the DynamoDB resource as a table route's first
+           call does, then serving OPTIONS (no request leaves the process)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+LAMBDA_API = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE = '''
+import json, os, sys, time
+sys.path.insert(0, os.environ['LAMBDA_API'])
+os.environ.update(AWS_ACCESS_KEY_ID='testing', AWS_SECRET_ACCESS_KEY='testing', AWS_DEFAULT_REGION='us-east-1')
+scenario = sys.argv[1]
+
+started = time.perf_counter()
+if scenario == 'eager':
+    import boto3
+    boto3.resource('dynamodb', region_name='us-east-1')
+    boto3.client('bedrock-runtime', region_name='us-east-1')
+import lambda_function
+imported = time.perf_counter()
+if scenario == 'lazy+db':
+    lambda_function.get_aws('resource', 'dynamodb')
+lambda_function.handle_request({'httpMethod': 'OPTIONS', 'path': '/scores', 'headers': {}})
+done = time.perf_counter()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'total_ms': (done - started) * 1000}))
+'''
+
+def sample(scenario):
+    env = dict(os.environ, LAMBDA_API=LAMBDA_API)
+    output = subprocess.run([sys.executable, '-c', SAMPLE, scenario], env=env, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"median of {args.runs} fresh processes (ms)")
+    print(f"  {'':10s} {'import':>8s} {'to first response':>18s}")
+    for scenario in ('eager', 'lazy', 'lazy+db'):
+        samples = [sample(scenario) for _ in range(args.runs)]
+        import_ms = statistics.median(s['import_ms'] for s in samples)
+        total_ms = statistics.median(s['total_ms'] for s in samples)
+        print(f"  {scenario:10s} {import_ms:8.1f} {total_ms:18.1f}")
+
+if __name__ == '__main__':
+    main()
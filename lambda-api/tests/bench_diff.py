@@ -0,0 +1,91 @@
+"""Benchmark: stream image diffing (diff_images) on large team records
+
+    python3 tests/bench_diff.py [--members 200] [--services 60] [--number 2000]
+
+Compares three ways of finding what changed in a team's MODIFY record:
+  legacy      the old hand-decoded checks (list lengths only, so a member rename is missed)
+  full decode deserialize both images, then compare the decoded dicts
+  diff_images compare the raw wire dicts field by field and decode only the changed fields
+"""
+import argparse
+import copy
+import timeit
+
+import conftest  # Puts lambda-api on sys.path
+import stream_handler
+
+def legacy_changes(old_image, new_image):
+    """Change detection from the old handle_team_update (without building the message)"""
+    changes = []
+    if int(old_image.get('use_case', {}).get('N', 0)) != int(new_image.get('use_case', {}).get('N', 0)):
+        changes.append('use_case')
+    if len(new_image.get('members', {}).get('L', [])) != len(old_image.get('members', {}).get('L', [])):
+        changes.append('members')
+    new_solution = new_image.get('solution_description', {}).get('S', '')
+    if new_solution and new_solution != old_solution(old_image):
+        changes.append('solution_description')
+    if len(new_image.get('services_used', {}).get('L', [])) != len(old_image.get('services_used', {}).get('L', [])):
+        changes.append('services_used')
+    return changes
+
+def old_solution(image):
+    return image.get('solution_description', {}).get('S', '')
+
+def full_decode_changes(old_image, new_image):
+    old = stream_handler.deserialize_image(old_image)
+    new = stream_handler.deserialize_image(new_image)
+    return [field for field in old.keys() | new.keys()
+            if field not in stream_handler.DIFF_IGNORED_FIELDS and old.get(field) != new.get(field)]
+
+def diff_changes(old_image, new_image):
+    return [change.field for change in stream_handler.diff_images(old_image, new_image)]
+
+def team_image(members, services):
+    return {
+        'team_id': {'S': 'vault-101'},
+        'team_name': {'S': 'Vault 101 Overseers'},
+        'catchphrase': {'S': 'War never changes'},
+        'use_case': {'N': '3'},
+        'solution_description': {'S': 'Pip-Boy fleet telemetry. ' * 200},
+        'members': {'L': [
+            {'M': {'name': {'S': f'Dweller {i}'}, 'email': {'S': f'dweller{i}@vault101.example'}, 'role': {'S': 'Engineer'}}}
+            for i in range(members)
+        ]},
+        'services_used': {'L': [{'S': f'Service {i}'} for i in range(services)]},
+        'scores_seen': {'NS': [str(i) for i in range(50)]},
+        'created_at': {'S': '2026-02-06T18:37:24Z'},
+        'updated_at': {'S': '2026-02-06T18:37:24Z'}
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--members', type=int, default=200)
+    parser.add_argument('--services', type=int, default=60)
+    parser.add_argument('--number', type=int, default=2000)
+    args = parser.parse_args()
+    
+    old = team_image(args.members, args.services)
+    scenarios = {}
+    
+    touched = copy.deepcopy(old)
+    touched['updated_at'] = {'S': '2026-02-07T09:00:00Z'}
+    scenarios['only updated_at'] = touched
+    
+    renamed = copy.deepcopy(touched)
+    renamed['members']['L'][args.members // 2]['M']['name'] = {'S': 'Renamed Dweller'}
+    scenarios['one member renamed'] = renamed
+    
+    described = copy.deepcopy(touched)
+    described['solution_description'] = {'S': 'Reworked pitch. ' * 300}
+    scenarios['description edited'] = described
+    
+    methods = [('legacy', legacy_changes), ('full decode', full_decode_changes), ('diff_images', diff_changes)]
+    print(f"team with {args.members} members, {args.services} services (us per record; changed fields found)")
+    for scenario, new in scenarios.items():
+        print(f"  {scenario}")
+        for label, detect in methods:
+            elapsed = min(timeit.repeat(lambda: detect(old, new), number=args.number, repeat=5)) / args.number * 1e6
+            print(f"    {label:12s} {elapsed:9.1f}us  {sorted(detect(old, new))}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: get_team_results' independent reads run one after another versus overlapped with fan_out
+
+    python3 tests/bench_fanout.py [--teams 30] [--panelists 3] [--runs 7]
+
+Runs against moto with a fixed latency added to every DynamoDB call, since moto has no network
+round trip to overlap. Voting is locked without a results snapshot, so each request reads live:
+  sequential  the old order: lock check, team score query, panelist names, scores scan, teams scan
+  fan_out     get_team_results, which overlaps the three independent reads
+Panelist names are dropped from the warm cache before every request.
+"""
+import argparse
+import contextlib
+import io
+
+from moto import mock_aws
+
+from conftest import create_tables, median_ms, simulated_latency
+import lambda_function
+
+def sequential_reads(team_id):
+    """The reads get_team_results made before fan_out, in the same order"""
+    lambda_function.judging_criteria_table.get_item(Key={'criteria_id': 'main'}, ConsistentRead=True)
+    team_scores = lambda_function.query_all(
+        lambda_function.scores_table,
+        KeyConditionExpression='team_id = :tid',
+        ExpressionAttributeValues={':tid': team_id}
+    )
+    lambda_function.get_panelist_names([s['panelist_id'] for s in team_scores])
+    lambda_function.scan_all(lambda_function.scores_table, lambda_function.SCAN_SEGMENTS,
+                             ProjectionExpression='team_id, #t', ExpressionAttributeNames={'#t': 'total'})
+    lambda_function.scan_all(lambda_function.teams_table, lambda_function.SCAN_SEGMENTS,
+                             ProjectionExpression='team_id, team_name')
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--teams', type=int, default=30)
+    parser.add_argument('--panelists', type=int, default=3)
+    parser.add_argument('--runs', type=int, default=7)
+    args = parser.parse_args()
+    
+    with mock_aws():
+        create_tables()
+        lambda_function.judging_criteria_table.put_item(Item={'criteria_id': 'main', 'voting_locked': True})
+        for p in range(args.panelists):
+            lambda_function.panelists_table.put_item(Item={'panelist_id': f'p{p}', 'name': f'Panelist {p}'})
+        for t in range(args.teams):
+            lambda_function.teams_table.put_item(Item={'team_id': f't{t}', 'team_name': f'Team {t}'})
+            for p in range(args.panelists):
+                lambda_function.scores_table.put_item(Item={
+                    'team_id': f't{t}', 'panelist_id': f'p{p}', 'presentation': 4, 'innovation': 4,
+                    'functionality': 3, 'aws_well_architected': 3, 'total': 14, 'comments': ''
+                })
+        
+        def cold_names(fn):
+            def run():
+                lambda_function.panelist_name_cache.clear()
+                fn()
+            return run
+        
+        print(f"{args.teams} teams x {args.panelists} panelists, SCAN_SEGMENTS={lambda_function.SCAN_SEGMENTS}, "
+              f"median of {args.runs} (ms)")
+        for latency_ms in (20, 50, 150):
+            with simulated_latency(latency_ms / 1000), contextlib.redirect_stdout(io.StringIO()):
+                sequential = median_ms(cold_names(lambda: sequential_reads('t0')), args.runs)
+                overlapped = median_ms(cold_names(lambda: lambda_function.get_team_results('t0')), args.runs)
+            print(f"  {latency_ms:4d}ms/call  sequential {sequential:7.1f}  fan_out {overlapped:7.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: response encoding of a 5,000-team leaderboard payload
+
+    python3 tests/bench_json.py [--teams 5000] [--panelists 10]
+
+Compares the old response() path (decimal_to_num copy, then json.dumps) with to_json on the
+stdlib encoder and, when it is installed, on orjson. Peak memory comes from tracemalloc.
+"""
+import argparse
+import json
+import tracemalloc
+from decimal import Decimal
+
+from conftest import median_ms  # Also puts lambda-api on sys.path
+import lambda_function
+
+def decimal_to_num(obj):
+    """The old response() pre-pass: a converted copy of the whole payload"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj % 1 == 0 else float(obj)
+    elif isinstance(obj, dict):
+        return {k: decimal_to_num(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [decimal_to_num(i) for i in obj]
+    return obj
+
+def build_payload(teams, panelists):
+    """GET /scores as it was before the leaderboard table: every team with its scores, plus all_scores"""
+    all_scores = []
+    leaderboard = []
+    for t in range(teams):
+        scores = [
+            {
+                'team_id': f'team-{t}', 'panelist_id': f'panelist-{p}',
+                'presentation': Decimal(1 + (t + p) % 5), 'innovation': Decimal(1 + (t * p) % 5),
+                'functionality': Decimal(3), 'aws_well_architected': Decimal(4), 'total': Decimal(12),
+                'comments': 'Strong demo, weak cost story', 'submitted_at': '2026-02-06T18:37:24Z'
+            }
+            for p in range(panelists)
+        ]
+        all_scores.extend(scores)
+        leaderboard.append({
+            'team_id': f'team-{t}', 'num_scores': panelists,
+            'avg_presentation': Decimal('3.1'), 'avg_innovation': Decimal('2.9'), 'avg_functionality': Decimal(3),
+            'avg_aws_well_architected': Decimal(4), 'avg_total': Decimal('13.0'), 'scores': scores
+        })
+    return {'leaderboard': leaderboard, 'all_scores': all_scores}
+
+def peak_kib(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--teams', type=int, default=5000)
+    parser.add_argument('--panelists', type=int, default=10)
+    args = parser.parse_args()
+    
+    payload = build_payload(args.teams, args.panelists)
+    installed_orjson = lambda_function.orjson
+    
+    def stdlib_to_json():
+        lambda_function.orjson = None
+        try:
+            return lambda_function.to_json(payload)
+        finally:
+            lambda_function.orjson = installed_orjson
+    
+    encoders = [
+        ('decimal_to_num + json.dumps (before)', lambda: json.dumps(decimal_to_num(payload))),
+        ('to_json, stdlib encoder', stdlib_to_json)
+    ]
+    if installed_orjson:
+        encoders.append(('to_json, orjson', lambda: lambda_function.to_json(payload)))
+    
+    assert len({json.dumps(json.loads(encode()), sort_keys=True) for _, encode in encoders}) == 1, 'encoders disagree'
+    
+    print(f"{args.teams} teams x {args.panelists} panelists, {len(stdlib_to_json()) / 1024:.0f} KiB of JSON")
+    for label, encode in encoders:
+        print(f"  {label:38s} {median_ms(encode):8.1f}ms  peak {peak_kib(encode):9.0f} KiB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark: leaderboard positions with RankIndex versus a sorted list
+
+    python3 tests/bench_ranking.py [--teams 10000] [--number 200]
+
+Compares the old rank_results approach (sort the averages, then find a team with a linear
+next(...) scan, and re-sort after any change) with ranking.RankIndex for:
+  build      rank every team from scratch
+  lookup     one team's position
+  update     one team's score changes and its position is read again
+  top_k(10)  the first ten rows of the leaderboard
+"""
+import argparse
+import random
+import timeit
+from decimal import Decimal
+
+import conftest  # Puts lambda-api on sys.path
+from ranking import RankIndex
+
+def legacy_leaderboard(averages):
+    """Old rank_results: teams sorted by average total, best first"""
+    leaderboard = [{'team_id': tid, 'avg_total': avg} for tid, avg in averages.items()]
+    leaderboard.sort(key=lambda x: x['avg_total'], reverse=True)
+    return leaderboard
+
+def legacy_position(leaderboard, team_id):
+    return next((i + 1 for i, item in enumerate(leaderboard) if item['team_id'] == team_id), None)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--teams', type=int, default=10000)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    # Decimal averages, as DynamoDB returns them, with plenty of ties
+    averages = {f'team-{i}': Decimal(rng.randint(0, 4000)) / 100 for i in range(args.teams)}
+    team_ids = list(averages)
+    probes = [rng.choice(team_ids) for _ in range(args.number)]
+    
+    leaderboard = legacy_leaderboard(averages)
+    index = RankIndex(averages)
+    for team_id in probes[:20]:
+        assert legacy_position(leaderboard, team_id) >= index.rank(team_id)  # Ties share the best rank
+    
+    def legacy_update(team_id):
+        averages[team_id] = Decimal(rng.randint(0, 4000)) / 100
+        return legacy_position(legacy_leaderboard(averages), team_id)
+    
+    def index_update(team_id):
+        index.update(team_id, Decimal(rng.randint(0, 4000)) / 100)
+        return index.rank(team_id)
+    
+    def per_call_us(fn, number):
+        return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+    
+    probe = iter(probes * 1000)
+    rows = [
+        ('build', lambda: legacy_leaderboard(averages), lambda: RankIndex(averages), 5),
+        ('lookup', lambda: legacy_position(leaderboard, next(probe)), lambda: index.rank(next(probe)), args.number),
+        ('update', lambda: legacy_update(next(probe)), lambda: index_update(next(probe)), 5),
+        ('top_k(10)', lambda: leaderboard[:10], lambda: index.top_k(10), args.number)
+    ]
+    print(f"{args.teams} teams (us per call)")
+    print(f"  {'':10s} {'sorted list':>12s} {'RankIndex':>12s}")
+    for label, legacy, indexed, number in rows:
+        print(f"  {label:10s} {per_call_us(legacy, number):12.1f} {per_call_us(indexed, number):12.1f}")
+
+if __name__ == '__main__':
+    main()
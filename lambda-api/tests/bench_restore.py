@@ -0,0 +1,47 @@
+"""Benchmark: backup_restore.restore_table with one vs several batch writers per table
+
+    python3 tests/bench_restore.py [--items 5000] [--latency-ms 30]
+
+Runs against moto with --latency-ms added to every call (each BatchWriteItem carries 25 items),
+since moto has no network round trip for the writers to overlap. moto's own CPU time per batch
+runs under the GIL, which caps the gain from more writers well below what DynamoDB allows.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from moto import mock_aws
+
+from conftest import create_tables, simulated_latency
+import backup_restore
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=5000)
+    parser.add_argument('--latency-ms', type=float, default=30)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp, mock_aws():
+        create_tables()
+        path = os.path.join(tmp, 'scores.ndjson')
+        with open(path, 'w') as f:
+            for i in range(args.items):
+                f.write(json.dumps({
+                    'team_id': {'S': f'team-{i // 20}'}, 'panelist_id': {'S': f'panelist-{i % 20}'},
+                    'total': {'N': '14'}, 'comments': {'S': 'x' * 200}
+                }) + '\n')
+        
+        print(f"{args.items} items, {args.latency_ms}ms per call")
+        for writers in (1, 4, 8):
+            with simulated_latency(args.latency_ms / 1000), contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                backup_restore.restore_table('scores', path, {'region_name': 'us-east-1'}, writers)
+                elapsed = time.perf_counter() - started
+            print(f"  {writers} writer(s): {elapsed:6.2f}s  ({args.items / elapsed:6.0f} items/s)")
+
+if __name__ == '__main__':
+    main()
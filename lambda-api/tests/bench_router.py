@@ -0,0 +1,109 @@
+"""Micro-benchmark: route table dispatch (match_route) vs the if-chain lambda_handler used to run
+
+    python3 tests/bench_router.py [--number 200000]
+
+legacy_dispatch copies the order and conditions of the old chain (only the matching, no handlers).
+Times are nanoseconds per dispatch; the old chain pays for every condition ahead of the route.
+"""
+import argparse
+import timeit
+
+import conftest  # Puts lambda-api on sys.path
+import lambda_function
+
+def legacy_dispatch(http_method, path):
+    """Route matching of the old lambda_handler, in its original order"""
+    if path == '/auth/team-login' and http_method == 'POST':
+        return 'team_login'
+    if path == '/auth/panelist-login' and http_method == 'POST':
+        return 'panelist_login'
+    if path == '/auth/team-register' and http_method == 'POST':
+        return 'team_register'
+    if path == '/use-cases' and http_method == 'GET':
+        return 'get_all_use_cases'
+    if path.startswith('/use-cases/') and http_method == 'GET':
+        return 'get_use_case', path.split('/')[-1]
+    if path == '/judging-criteria' and http_method == 'GET':
+        return 'get_judging_criteria'
+    if path == '/voting-status' and http_method == 'GET':
+        return 'get_voting_status'
+    if path.startswith('/team-card/') and http_method == 'GET':
+        return 'get_public_team_card', path.split('/')[-1]
+    if path == '/ai/generate' and http_method == 'POST':
+        return 'generate_ai_text'
+    if path == '/team/me' and http_method == 'GET':
+        return 'get_team'
+    if path == '/team/me' and http_method == 'PUT':
+        return 'update_team'
+    if path == '/team/me/results' and http_method == 'GET':
+        return 'get_team_results'
+    if path == '/teams' and http_method == 'GET':
+        return 'get_all_teams'
+    if path.startswith('/teams/') and http_method == 'GET':
+        return 'get_team', path.split('/')[-1]
+    if path == '/scores' and http_method == 'POST':
+        return 'submit_score'
+    if path == '/scores' and http_method == 'GET':
+        return 'get_all_scores'
+    if path.startswith('/scores/') and http_method == 'GET':
+        return 'get_team_scores', path.split('/')[-1]
+    if path == '/use-cases' and http_method == 'POST':
+        return 'create_use_case'
+    if path.startswith('/use-cases/') and http_method == 'PUT':
+        return 'update_use_case', path.split('/')[-1]
+    if path.startswith('/use-cases/') and http_method == 'DELETE':
+        return 'delete_use_case', path.split('/')[-1]
+    if path == '/judging-criteria' and http_method == 'PUT':
+        return 'update_judging_criteria'
+    if path == '/voting-status' and http_method == 'PUT':
+        return 'toggle_voting_status'
+    if path.startswith('/teams/') and path.endswith('/reset-password') and http_method == 'PUT':
+        return 'admin_reset_team_password', path.split('/')[2]
+    if path.startswith('/teams/') and http_method == 'DELETE':
+        return 'admin_delete_team', path.split('/')[-1]
+    if path == '/panelists' and http_method == 'GET':
+        return 'get_all_panelists'
+    if path == '/panelists' and http_method == 'POST':
+        return 'create_panelist'
+    if path.startswith('/panelists/') and path.endswith('/reset-password') and http_method == 'PUT':
+        return 'admin_reset_panelist_password', path.split('/')[2]
+    if path.startswith('/panelists/') and path.endswith('/toggle-admin') and http_method == 'PUT':
+        return 'toggle_panelist_admin', path.split('/')[2]
+    return None
+
+REQUESTS = [
+    ('first route', 'POST', '/auth/team-login'),
+    ('GET /scores', 'GET', '/scores'),
+    ('GET /use-cases/{id}', 'GET', '/use-cases/3'),
+    ('last route', 'PUT', '/panelists/overseer-7/toggle-admin'),
+    ('no match (404)', 'GET', '/nothing/here')
+]
+
+def ns_per_call(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=200000)
+    args = parser.parse_args()
+    
+    # The same table plus 200 more templated routes, to show extra routes don't slow the others
+    extra = [lambda_function.route('GET', f'/extra-{i}/{{item_id}}', 'public', None) for i in range(200)]
+    crowded = lambda_function.compile_routes(lambda_function.ROUTES + extra)
+    
+    print(f"{'request':22s} {'if-chain':>10s} {'route table':>12s} {'+200 routes':>12s}  (ns per dispatch)")
+    for label, method, path in REQUESTS:
+        legacy = ns_per_call(lambda: legacy_dispatch(method, path), args.number)
+        table = ns_per_call(lambda: lambda_function.match_route(method, path), args.number)
+        
+        routes = lambda_function.STATIC_ROUTES, lambda_function.DYNAMIC_ROUTES
+        lambda_function.STATIC_ROUTES, lambda_function.DYNAMIC_ROUTES = crowded
+        try:
+            with_extra = ns_per_call(lambda: lambda_function.match_route(method, path), args.number)
+        finally:
+            lambda_function.STATIC_ROUTES, lambda_function.DYNAMIC_ROUTES = routes
+        
+        print(f"{label:22s} {legacy:10.0f} {table:12.0f} {with_extra:12.0f}")
+
+if __name__ == '__main__':
+    main()
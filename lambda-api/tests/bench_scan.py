@@ -0,0 +1,71 @@
+"""Benchmark: paginated and parallel segmented scans (scan_all) against a latency model of DynamoDB
+
+    python3 tests/bench_scan.py [--items 100000] [--page-size 2000] [--latency-ms 25]
+
+moto does a full table walk per scan call, so its CPU cost swamps the I/O that parallel segments
+overlap. This runs scan_all against an in-memory table instead: each call sleeps --latency-ms
+(round trip plus DynamoDB's read time for a page) and returns at most --page-size items, the way
+a real scan is cut into 1 MB pages.
+"""
+import argparse
+import time
+import zlib
+
+from conftest import median_ms  # Also puts lambda-api on sys.path
+import lambda_function
+
+class ModelClient:
+    """Just enough of the DynamoDB client for scan: pages, Segment/TotalSegments and a fixed latency"""
+    
+    def __init__(self, items, page_size, latency):
+        self.items = items
+        self.page_size = page_size
+        self.latency = latency
+        self.segments = {}  # TotalSegments -> items of each segment, split by partition key hash
+    
+    def scan(self, TableName, Segment=0, TotalSegments=1, ExclusiveStartKey=None, **kwargs):
+        if TotalSegments not in self.segments:
+            split = [[] for _ in range(TotalSegments)]
+            for item in self.items:
+                split[zlib.crc32(item['team_id'].encode()) % TotalSegments].append(item)
+            self.segments[TotalSegments] = split
+        segment_items = self.segments[TotalSegments][Segment]
+        
+        time.sleep(self.latency)
+        start = ExclusiveStartKey['position'] if ExclusiveStartKey else 0
+        end = start + self.page_size
+        result = {'Items': segment_items[start:end]}
+        if end < len(segment_items):
+            result['LastEvaluatedKey'] = {'position': end}
+        return result
+
+class ModelTable:
+    def __init__(self, client):
+        self.name = 'aais-hackathon-scores'
+        self.meta = type('Meta', (), {'client': client})()
+    
+    def scan(self, **kwargs):
+        return self.meta.client.scan(TableName=self.name, **kwargs)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--page-size', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=25)
+    args = parser.parse_args()
+    
+    items = [{'team_id': f'team-{i // 50}', 'panelist_id': f'panelist-{i % 50}', 'total': 14} for i in range(args.items)]
+    client = ModelClient(items, args.page_size, args.latency_ms / 1000)
+    table = ModelTable(client)
+    
+    print(f"{args.items} items, {args.page_size} per page, {args.latency_ms}ms per call")
+    rows = [('single scan() call (before)', len(table.scan()['Items']), median_ms(table.scan))]
+    for segments in (1, 4, 8, 16):
+        count = len(lambda_function.scan_all(table, segments))
+        rows.append((f'scan_all, {segments} segment(s)', count, median_ms(lambda: lambda_function.scan_all(table, segments))))
+    
+    for label, count, elapsed in rows:
+        print(f"  {label:30s} {count:7d} items {elapsed:9.1f}ms")
+
+if __name__ == '__main__':
+    main()
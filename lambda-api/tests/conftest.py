@@ -0,0 +1,92 @@
+import contextlib
+import os
+import statistics
+import sys
+import threading
+import time
+
+import boto3
+import botocore.client
+import pytest
+from moto import mock_aws
+
+# Fake credentials so nothing can reach a real account
+os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
+os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
+os.environ['AWS_DEFAULT_REGION'] = 'us-east-1'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Table name -> (attribute name, type, key type), as created in INFRASTRUCTURE.md
+TABLES = {
+    'aais-hackathon-teams': [('team_id', 'S', 'HASH')],
+    'aais-hackathon-panelists': [('panelist_id', 'S', 'HASH')],
+    'aais-hackathon-scores': [('team_id', 'S', 'HASH'), ('panelist_id', 'S', 'RANGE')],
+    'aais-hackathon-use-cases': [('use_case_id', 'N', 'HASH')],
+    'aais-hackathon-judging-criteria': [('criteria_id', 'S', 'HASH')],
+    'aais-hackathon-leaderboard': [('team_id', 'S', 'HASH')],
+    'aais-hackathon-counters': [('counter_name', 'S', 'HASH')],
+    'aais-hackathon-stream-dedupe': [('event_id', 'S', 'HASH')],
+    'aais-hackathon-notification-state': [('team_id', 'S', 'HASH')],
+    'aais-hackathon-changes': [('entity', 'S', 'HASH'), ('change_key', 'S', 'RANGE')],
+    'aais-hackathon-results': [('team_id', 'S', 'HASH')]
+}
+
+def create_tables():
+    """Create every table the API and stream handlers use (call inside mock_aws)"""
+    client = boto3.client('dynamodb', region_name='us-east-1')
+    for name, keys in TABLES.items():
+        client.create_table(
+            TableName=name,
+            AttributeDefinitions=[{'AttributeName': attr, 'AttributeType': attr_type} for attr, attr_type, _ in keys],
+            KeySchema=[{'AttributeName': attr, 'KeyType': key_type} for attr, _, key_type in keys],
+            BillingMode='PAY_PER_REQUEST'
+        )
+    return client
+
+@contextlib.contextmanager
+def simulated_latency(seconds):
+    """Add a fixed delay to every AWS call, standing in for the network round trip moto doesn't have"""
+    make_api_call = botocore.client.BaseClient._make_api_call
+    def delayed(self, operation_name, api_params):
+        time.sleep(seconds)
+        return make_api_call(self, operation_name, api_params)
+    botocore.client.BaseClient._make_api_call = delayed
+    try:
+        yield
+    finally:
+        botocore.client.BaseClient._make_api_call = make_api_call
+
+@contextlib.contextmanager
+def atomic_requests():
+    """Apply one AWS call at a time: DynamoDB makes each request atomic, moto does no locking of its own"""
+    make_api_call = botocore.client.BaseClient._make_api_call
+    lock = threading.Lock()
+    def serialized(self, operation_name, api_params):
+        with lock:
+            return make_api_call(self, operation_name, api_params)
+    botocore.client.BaseClient._make_api_call = serialized
+    try:
+        yield
+    finally:
+        botocore.client.BaseClient._make_api_call = make_api_call
+
+def median_ms(fn, runs=5):
+    """Median wall time of fn() in milliseconds (used by the bench_*.py scripts)"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+@pytest.fixture
+def aws():
+    """Empty moto-backed tables; import the modules under test inside the test"""
+    # Modules stay imported between tests, so drop whatever a previous test left in the warm-container caches
+    lambda_function = sys.modules.get('lambda_function')
+    if lambda_function:
+        for cache in (lambda_function.read_cache, lambda_function.panelist_name_cache, lambda_function.verified_tokens):
+            cache.clear()
+    with mock_aws():
+        yield create_tables()
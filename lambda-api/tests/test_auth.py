@@ -0,0 +1,24 @@
+import lambda_function
+
+def bearer(token):
+    return {'headers': {'Authorization': f'Bearer {token}'}}
+
+def test_cached_token_still_expires(monkeypatch):
+    lambda_function.verified_tokens.clear()
+    token = lambda_function.create_jwt({'type': 'team', 'team_id': 'vault-101'})
+    assert lambda_function.get_auth_context(bearer(token))['team_id'] == 'vault-101'
+    assert token in lambda_function.verified_tokens
+    
+    expiry = lambda_function.verified_tokens[token]['exp']
+    monkeypatch.setattr(lambda_function.time, 'time', lambda: expiry + 1)
+    assert lambda_function.get_auth_context(bearer(token)) is None
+    assert token not in lambda_function.verified_tokens
+
+def test_tampered_token_is_rejected_after_a_valid_one_is_cached():
+    lambda_function.verified_tokens.clear()
+    token = lambda_function.create_jwt({'type': 'team', 'team_id': 'vault-101'})
+    assert lambda_function.get_auth_context(bearer(token))
+    
+    header, payload, signature = token.split('.')
+    forged = lambda_function.create_jwt({'type': 'panelist', 'panelist_id': 'p1', 'is_admin': True}).split('.')[1]
+    assert lambda_function.get_auth_context(bearer(f'{header}.{forged}.{signature}')) is None
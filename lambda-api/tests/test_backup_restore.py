@@ -0,0 +1,63 @@
+import gzip
+import json
+
+from conftest import atomic_requests
+
+SESSION_ARGS = {'region_name': 'us-east-1'}
+
+def seed_teams(aws, count):
+    for i in range(count):
+        aws.put_item(TableName='aais-hackathon-teams', Item={
+            'team_id': {'S': f'team-{i:04d}'},
+            'team_name': {'S': f'Überwald Vault {i} ☢'},
+            'use_case': {'N': str(1 + i % 6)},
+            'members': {'L': [{'M': {'name': {'S': 'Żaneta'}}}]}
+        })
+
+def scan_teams(aws):
+    items = []
+    params = {'TableName': 'aais-hackathon-teams'}
+    while True:
+        result = aws.scan(**params)
+        items.extend(result['Items'])
+        if 'LastEvaluatedKey' not in result:
+            return sorted(items, key=lambda item: item['team_id']['S'])
+        params['ExclusiveStartKey'] = result['LastEvaluatedKey']
+
+def test_round_trip_with_parallel_writers(aws, tmp_path):
+    import backup_restore
+    
+    seed_teams(aws, 1200)
+    original = scan_teams(aws)
+    
+    with atomic_requests():
+        backed_up = backup_restore.backup_table('teams', str(tmp_path), 4, SESSION_ARGS)
+    path = tmp_path / 'teams.ndjson.gz'
+    raw = gzip.decompress(path.read_bytes())
+    assert backed_up == {'items': 1200, 'bytes': len(raw)}
+    
+    for item in original:
+        aws.delete_item(TableName='aais-hackathon-teams', Key={'team_id': item['team_id']})
+    
+    with atomic_requests():
+        restored = backup_restore.restore_table('teams', str(path), SESSION_ARGS, writers=4)
+    assert restored['items'] == 1200
+    # Byte counts are of the encoded UTF-8 text
+    assert restored['bytes'] == sum(len(json.dumps(item).encode('utf-8')) for item in backup_restore.read_items(str(path)))
+    assert scan_teams(aws) == original
+    assert not (tmp_path / 'teams.ndjson.gz.progress').exists()
+
+def test_restore_resumes_after_checkpoint(aws, tmp_path):
+    import backup_restore
+    
+    path = tmp_path / 'teams.ndjson'
+    path.write_text(''.join(
+        json.dumps({'team_id': {'S': f'team-{i:04d}'}, 'team_name': {'S': f'Team {i}'}}) + '\n' for i in range(1200)
+    ))
+    (tmp_path / 'teams.ndjson.progress').write_text('1000')
+    
+    with atomic_requests():
+        restored = backup_restore.restore_table('teams', str(path), SESSION_ARGS, writers=4)
+    
+    assert restored['items'] == 200
+    assert [item['team_id']['S'] for item in scan_teams(aws)] == [f'team-{i:04d}' for i in range(1000, 1200)]
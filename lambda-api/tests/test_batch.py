@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+class ThrottlingResource:
+    """Stands in for the DynamoDB resource, leaving every batch unprocessed for the first `throttled` calls"""
+    
+    def __init__(self, throttled):
+        self.throttled = throttled
+        self.calls = 0
+        self.meta = SimpleNamespace(client=self)  # The helpers call through resource.meta.client
+    
+    def batch_get_item(self, RequestItems):
+        self.calls += 1
+        if self.calls <= self.throttled:
+            return {'Responses': {}, 'UnprocessedKeys': RequestItems}
+        return {'Responses': {name: request['Keys'] for name, request in RequestItems.items()}}
+    
+    def batch_write_item(self, RequestItems):
+        self.calls += 1
+        if self.calls <= self.throttled:
+            return {'UnprocessedItems': RequestItems}
+        return {'UnprocessedItems': {}}
+
+@pytest.fixture
+def throttled(monkeypatch):
+    import lambda_function
+    
+    def install(calls):
+        resource = ThrottlingResource(calls)
+        monkeypatch.setattr(lambda_function, 'get_aws', lambda kind, service: resource)
+        monkeypatch.setattr(lambda_function.time, 'sleep', lambda seconds: None)
+        return resource
+    return install
+
+def test_batch_get_retries_unprocessed_keys(throttled):
+    import lambda_function
+    
+    resource = throttled(2)
+    keys = [{'panelist_id': 'p1'}, {'panelist_id': 'p2'}]
+    assert lambda_function.batch_get_items(lambda_function.panelists_table, keys) == keys
+    assert resource.calls == 3
+
+def test_batch_get_gives_up_after_max_attempts(throttled):
+    import lambda_function
+    
+    resource = throttled(100)
+    with pytest.raises(RuntimeError):
+        lambda_function.batch_get_items(lambda_function.panelists_table, [{'panelist_id': 'p1'}])
+    assert resource.calls == lambda_function.BATCH_MAX_ATTEMPTS
+
+def test_batch_delete_retries_unprocessed_items(throttled):
+    import lambda_function
+    
+    resource = throttled(3)
+    keys = [{'team_id': 't1', 'panelist_id': f'p{i}'} for i in range(30)]
+    assert lambda_function.batch_delete_items(lambda_function.scores_table, keys) == 30
+    assert resource.calls == 5  # 3 throttled calls, then one per chunk (25 + 5 keys)
+
+def test_batch_delete_gives_up_after_max_attempts(throttled):
+    import lambda_function
+    
+    resource = throttled(100)
+    with pytest.raises(RuntimeError):
+        lambda_function.batch_delete_items(lambda_function.scores_table, [{'team_id': 't1', 'panelist_id': 'p1'}])
+    assert resource.calls == lambda_function.BATCH_MAX_ATTEMPTS
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+def export(lambda_function, dataset, **query):
+    return lambda_function.export_dataset(dataset, query)
+
+@pytest.mark.parametrize('limit', ['0', '-5', 'ten', '2.5'])
+def test_invalid_limit_is_rejected(aws, limit):
+    import lambda_function
+    
+    assert export(lambda_function, 'teams', limit=limit)['statusCode'] == 400
+
+def test_leaderboard_ranks_span_pages(aws):
+    import lambda_function
+    
+    # Average totals 20, 18, 18, 15, 12; the tied teams share rank 2 and the next is 4
+    averages = {'alpha': 20, 'bravo': 18, 'charlie': 18, 'delta': 15, 'echo': 12}
+    for team_id, average in averages.items():
+        lambda_function.leaderboard_table.put_item(Item={'team_id': team_id, 'num_scores': 2, 'sum_total': average * 2})
+    lambda_function.leaderboard_table.put_item(Item={'team_id': 'unscored', 'num_scores': 0, 'sum_total': 0})
+    
+    rows, query = [], {'limit': '2'}
+    while True:
+        result = export(lambda_function, 'leaderboard', **query)
+        assert result['statusCode'] == 200
+        page = [json.loads(line) for line in result['body'].splitlines()]
+        assert len(page) <= 2
+        rows.extend(page)
+        if 'X-Next-Cursor' not in result['headers']:
+            break
+        query = {'limit': '2', 'cursor': result['headers']['X-Next-Cursor']}
+    
+    assert [(row['rank'], row['team_id']) for row in rows] == [
+        (1, 'alpha'), (2, 'bravo'), (2, 'charlie'), (4, 'delta'), (5, 'echo')
+    ]
+
+@pytest.mark.parametrize('dataset, cursor', [
+    ('teams', {'team_id': 't1', 'panelist_id': 'p1'}),
+    ('teams', {'id': 't1'}),
+    ('teams', {'team_id': 7}),
+    ('scores', {'team_id': 't1'}),
+    ('leaderboard', {'offset': 'two'}),
+    ('leaderboard', {'team_id': 't1'}),
+    ('teams', ['t1'])
+])
+def test_cursor_of_the_wrong_shape_is_rejected(aws, dataset, cursor):
+    import lambda_function
+    
+    result = export(lambda_function, dataset, cursor=lambda_function.encode_cursor(cursor))
+    assert result['statusCode'] == 400
+
+def test_scan_cursor_round_trips(aws):
+    import lambda_function
+    
+    for i in range(3):
+        lambda_function.scores_table.put_item(Item={'team_id': f't{i}', 'panelist_id': 'p1', 'total': 10})
+    
+    first = export(lambda_function, 'scores', limit='2')
+    second = export(lambda_function, 'scores', limit='2', cursor=first['headers']['X-Next-Cursor'])
+    assert second['statusCode'] == 200
+    teams = [json.loads(line)['team_id'] for line in first['body'].splitlines() + second['body'].splitlines()]
+    assert sorted(teams) == ['t0', 't1', 't2']
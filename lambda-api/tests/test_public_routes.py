@@ -0,0 +1,21 @@
+import json
+
+def test_judging_criteria_hides_snapshot_id_and_is_cacheable(aws):
+    import lambda_function
+    
+    lambda_function.judging_criteria_table.put_item(Item={
+        'criteria_id': 'main', 'intro': 'Judge well', 'voting_locked': True, 'results_snapshot_id': 'snap-1'
+    })
+    
+    result = lambda_function.lambda_handler({'httpMethod': 'GET', 'path': '/judging-criteria', 'headers': {}}, None)
+    assert result['statusCode'] == 200
+    assert result['headers']['Cache-Control'] == 'public, max-age=15, s-maxage=30'
+    body = json.loads(result['body'])
+    assert body['intro'] == 'Judge well'
+    assert 'results_snapshot_id' not in body
+    
+    # Once max-age runs out the browser revalidates with the ETag and gets a 304 while nothing changed
+    revalidated = lambda_function.lambda_handler({
+        'httpMethod': 'GET', 'path': '/judging-criteria', 'headers': {'If-None-Match': result['headers']['ETag']}
+    }, None)
+    assert revalidated['statusCode'] == 304
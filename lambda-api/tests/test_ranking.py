@@ -0,0 +1,37 @@
+import random
+from decimal import Decimal
+
+from ranking import RankIndex
+
+def test_tied_teams_share_a_rank_and_the_next_skips():
+    index = RankIndex({'a': 30, 'b': 25, 'c': 25, 'd': 10})
+    assert [index.rank(team_id) for team_id in 'abcd'] == [1, 2, 2, 4]
+    assert index.ranked() == [(1, 'a', 30), (2, 'b', 25), (2, 'c', 25), (4, 'd', 10)]
+    assert index.top_k(3) == [(1, 'a', 30), (2, 'b', 25), (2, 'c', 25)]
+    assert index.rank('missing') is None
+
+def test_update_and_remove_move_ranks():
+    index = RankIndex({'a': Decimal('30'), 'b': Decimal('25.5')})
+    index.update('c', Decimal('40'))
+    index.update('a', Decimal('20'))
+    assert [index.rank(team_id) for team_id in 'cba'] == [1, 2, 3]
+    assert index.score('a') == Decimal('20')
+    
+    index.remove('c')
+    index.remove('missing')  # No-op
+    assert 'c' not in index
+    assert len(index) == 2
+    assert index.ranked() == [(1, 'b', Decimal('25.5')), (2, 'a', Decimal('20'))]
+
+def test_ranks_match_a_full_sort():
+    rng = random.Random(7)
+    scores = {f't{i}': rng.randint(0, 20) for i in range(300)}
+    index = RankIndex()
+    for team_id, score in scores.items():
+        index.update(team_id, score)
+    for team_id in rng.sample(list(scores), 100):
+        scores[team_id] = rng.randint(0, 20)
+        index.update(team_id, scores[team_id])
+    
+    for team_id, score in scores.items():
+        assert index.rank(team_id) == 1 + sum(other > score for other in scores.values())
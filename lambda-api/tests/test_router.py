@@ -0,0 +1,30 @@
+import pytest
+
+import lambda_function
+
+@pytest.mark.parametrize('method, path, template, params', [
+    ('GET', '/scores', '/scores', {}),
+    ('GET', '/use-cases/3', '/use-cases/{use_case_id:int}', {'use_case_id': '3'}),
+    ('PUT', '/teams/vault-101/reset-password', '/teams/{team_id}/reset-password', {'team_id': 'vault-101'}),
+    ('PUT', '/panelists/p1/toggle-admin', '/panelists/{panelist_id}/toggle-admin', {'panelist_id': 'p1'}),
+    ('PUT', '/panelists/p1/reset-password', '/panelists/{panelist_id}/reset-password', {'panelist_id': 'p1'}),
+    ('DELETE', '/teams/vault-101', '/teams/{team_id}', {'team_id': 'vault-101'})
+])
+def test_match_route(method, path, template, params):
+    r, raw_params = lambda_function.match_route(method, path)
+    assert r['template'] == template
+    assert raw_params == params
+
+@pytest.mark.parametrize('method, path', [
+    ('GET', '/nothing/here'),
+    ('DELETE', '/scores'),
+    ('PUT', '/teams//reset-password'),
+    ('PUT', '/panelists/p1/promote'),
+    ('GET', '/teams/vault-101/extra')
+])
+def test_unmatched_paths(method, path):
+    assert lambda_function.match_route(method, path) == (None, None)
+
+def test_template_starting_with_a_parameter_is_rejected():
+    with pytest.raises(ValueError):
+        lambda_function.compile_routes([lambda_function.route('GET', '/{team_id}/card', 'public', None)])
@@ -0,0 +1,13 @@
+def test_scan_all_follows_every_page(aws):
+    import lambda_function
+    
+    with lambda_function.teams_table.batch_writer() as batch:
+        for i in range(60):
+            batch.put_item(Item={'team_id': f'team-{i}', 'team_name': f'Team {i}'})
+    
+    expected = {f'team-{i}' for i in range(60)}
+    # Limit forces the same paging DynamoDB applies at 1 MB
+    for segments in (1, 4):
+        items = lambda_function.scan_all(lambda_function.teams_table, segments, Limit=7)
+        assert len(items) == 60
+        assert {item['team_id'] for item in items} == expected
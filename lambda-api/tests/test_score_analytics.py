@@ -0,0 +1,63 @@
+import json
+from decimal import Decimal
+
+from score_analytics import analyze_scores
+
+def score(team_id, panelist_id, total):
+    """A score row whose four categories add up to total"""
+    values = [total // 4 + (1 if i < total % 4 else 0) for i in range(4)]
+    return {'team_id': team_id, 'panelist_id': panelist_id, 'total': Decimal(total),
+            **{category: Decimal(value) for category, value in
+               zip(['presentation', 'innovation', 'functionality', 'aws_well_architected'], values)}}
+
+# The harsh judge scored alpha and charlie, the lenient judge bravo and delta
+SCORES = [score('alpha', 'harsh', 10), score('charlie', 'harsh', 6), score('bravo', 'lenient', 16), score('delta', 'lenient', 18)]
+TEAMS = [{'team_id': 'alpha', 'team_name': 'Alpha', 'use_case': Decimal(1)}, {'team_id': 'bravo', 'use_case': Decimal(1)},
+         {'team_id': 'charlie', 'use_case': Decimal(2)}, {'team_id': 'delta', 'use_case': Decimal(1)}]
+
+def test_normalization_corrects_for_harsh_and_lenient_judges():
+    analytics = analyze_scores(SCORES, TEAMS)
+    rows = {row['team_id']: row for row in analytics['teams']}
+    
+    # Raw averages favour whoever drew the lenient judge
+    assert [rows[t]['use_case_rank'] for t in ('delta', 'bravo', 'alpha')] == [1, 2, 3]
+    # Each team's z-score against its own judge: alpha and delta were their judge's best
+    assert [rows[t]['normalized_score'] for t in ('alpha', 'bravo', 'charlie', 'delta')] == [1.0, -1.0, -1.0, 1.0]
+    assert [rows[t]['normalized_use_case_rank'] for t in ('alpha', 'delta', 'bravo')] == [1, 1, 3]
+    # charlie is ranked within its own use case
+    assert (rows['charlie']['use_case'], rows['charlie']['use_case_rank']) == (2, 1)
+    assert [row['team_id'] for row in analytics['teams']] == ['alpha', 'delta', 'bravo', 'charlie']
+    
+    assert rows['alpha']['team_name'] == 'Alpha'
+    assert rows['alpha']['category_means'] == {'presentation': 3, 'innovation': 3, 'functionality': 2, 'aws_well_architected': 2}
+    assert analytics['panelists'] == [
+        {'panelist_id': 'harsh', 'num_scores': 2, 'mean_total': 8.0, 'std_total': 2.0},
+        {'panelist_id': 'lenient', 'num_scores': 2, 'mean_total': 17.0, 'std_total': 1.0}
+    ]
+
+def test_variance_and_a_judge_with_no_spread():
+    # steady gives everyone 12, so carries no ranking signal; picky separates the teams
+    scores = [score('alpha', 'steady', 12), score('bravo', 'steady', 12), score('alpha', 'picky', 16), score('bravo', 'picky', 8)]
+    rows = {row['team_id']: row for row in analyze_scores(scores, [])['teams']}
+    
+    assert rows['alpha']['avg_total'] == 14
+    assert rows['alpha']['total_variance'] == 4  # Totals 12 and 16
+    assert rows['alpha']['normalized_score'] == 0.5  # (0 + 1) / 2
+    assert rows['bravo']['normalized_score'] == -0.5
+    assert rows['alpha']['use_case'] == 0  # Unknown teams share use case 0
+
+def test_analytics_route(aws):
+    import lambda_function
+    
+    for row in SCORES:
+        lambda_function.scores_table.put_item(Item=row)
+    for team in TEAMS:
+        lambda_function.teams_table.put_item(Item=team)
+    lambda_function.panelists_table.put_item(Item={'panelist_id': 'harsh', 'name': 'Elder Maxson'})
+    
+    result = lambda_function.get_score_analytics()
+    assert result['statusCode'] == 200
+    body = json.loads(result['body'])
+    assert len(body['teams']) == 4
+    assert [panelist['name'] for panelist in body['panelists']] == ['Elder Maxson', 'lenient']
+    assert 'compute' in body['timings_ms']
@@ -0,0 +1,81 @@
+import time
+
+def score_record(event_id, sequence, event_name, new=None, old=None):
+    """Stream record for a score by panelist p1 on team t1"""
+    def image(values):
+        return {'team_id': {'S': 't1'}, 'panelist_id': {'S': 'p1'},
+                **{field: {'N': str(value)} for field, value in values.items()}}
+    
+    data = {'Keys': {'team_id': {'S': 't1'}, 'panelist_id': {'S': 'p1'}}, 'SequenceNumber': sequence,
+            'ApproximateCreationDateTime': 1790000000}
+    if new:
+        data['NewImage'] = image(new)
+    if old:
+        data['OldImage'] = image(old)
+    return {'eventID': event_id, 'eventName': event_name, 'dynamodb': data}
+
+FIRST = {'presentation': 5, 'innovation': 4, 'functionality': 3, 'aws_well_architected': 2, 'total': 14}
+SECOND = {'presentation': 3, 'innovation': 3, 'functionality': 3, 'aws_well_architected': 3, 'total': 12}
+
+def test_replayed_batch_is_applied_once(aws):
+    import score_stream_handler
+    
+    batch = {'Records': [
+        score_record('e1', '100', 'INSERT', new=FIRST),
+        score_record('e2', '101', 'MODIFY', new=SECOND, old=FIRST)
+    ]}
+    assert score_stream_handler.lambda_handler(batch, None) == {'batchItemFailures': []}
+    assert score_stream_handler.lambda_handler(batch, None) == {'batchItemFailures': []}
+    
+    row = score_stream_handler.leaderboard_table.get_item(Key={'team_id': 't1'})['Item']
+    assert row['num_scores'] == 1
+    assert row['sum_total'] == 12
+    assert row['sum_presentation'] == 3
+
+def test_failed_record_is_reported(aws, monkeypatch):
+    import score_stream_handler
+    
+    real_apply = score_stream_handler.apply_score_delta
+    def flaky_apply(event_id, new_image, old_image):
+        if event_id == 'e2':
+            raise RuntimeError('throttled')
+        return real_apply(event_id, new_image, old_image)
+    monkeypatch.setattr(score_stream_handler, 'apply_score_delta', flaky_apply)
+    
+    batch = {'Records': [
+        score_record('e1', '100', 'INSERT', new=FIRST),
+        score_record('e2', '101', 'REMOVE', old=FIRST)
+    ]}
+    assert score_stream_handler.lambda_handler(batch, None) == {'batchItemFailures': [{'itemIdentifier': '101'}]}
+    
+    # Lambda retries from the failed record; the already applied INSERT is not counted again
+    monkeypatch.setattr(score_stream_handler, 'apply_score_delta', real_apply)
+    assert score_stream_handler.lambda_handler(batch, None) == {'batchItemFailures': []}
+    assert score_stream_handler.leaderboard_table.get_item(Key={'team_id': 't1'})['Item']['num_scores'] == 0
+
+def test_late_stream_record_is_seen_by_an_earlier_cursor(aws):
+    import lambda_function
+    import score_stream_handler
+    
+    # Handed out a minute ago; the record below was written long before that but only logged now
+    cursor = lambda_function.encode_cursor({'t': int(time.time()) - 60})
+    score_stream_handler.lambda_handler({'Records': [score_record('e1', '100', 'INSERT', new=FIRST)]}, None)
+    
+    upserted, deleted, error = lambda_function.read_changes('scores', cursor)
+    assert error is None
+    assert upserted == [{'team_id': 't1', 'panelist_id': 'p1'}]
+    assert deleted == []
+
+def test_rebuild_clears_teams_without_scores(aws):
+    import score_stream_handler
+    
+    score_stream_handler.leaderboard_table.put_item(Item={'team_id': 'gone', 'num_scores': 2, 'sum_total': 20})
+    score_stream_handler.leaderboard_table.put_item(Item={'team_id': 't1', 'num_scores': 5, 'sum_total': 99})
+    score_stream_handler.scores_table.put_item(Item={'team_id': 't1', 'panelist_id': 'p1', **FIRST})
+    
+    score_stream_handler.rebuild_leaderboard()
+    
+    assert 'Item' not in score_stream_handler.leaderboard_table.get_item(Key={'team_id': 'gone'})
+    row = score_stream_handler.leaderboard_table.get_item(Key={'team_id': 't1'})['Item']
+    assert row['num_scores'] == 1
+    assert row['sum_total'] == 14
@@ -0,0 +1,48 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import atomic_requests, simulated_latency
+
+USE_CASE = {field: 'x' for field in ['name', 'archetype', 'quote', 'background', 'reality', 'persona', 'tension', 'focus', 'challenges', 'values']}
+
+# Each request is applied atomically (as DynamoDB does) after a 2ms delay outside the lock,
+# so concurrent callers interleave between their requests the way separate Lambdas would
+
+def scan_max_plus_one(lambda_function):
+    """The allocator create_use_case used before the counter: scan for the highest ID, add one"""
+    items = lambda_function.use_cases_table.scan(ProjectionExpression='use_case_id')['Items']
+    next_id = max((int(item['use_case_id']) for item in items), default=0) + 1
+    lambda_function.use_cases_table.put_item(Item={'use_case_id': next_id})
+    return next_id
+
+def test_harness_catches_a_racy_allocator(aws):
+    import lambda_function
+    
+    with atomic_requests(), simulated_latency(0.002), ThreadPoolExecutor(max_workers=8) as pool:
+        ids = list(pool.map(lambda _: scan_max_plus_one(lambda_function), range(40)))
+    
+    assert len(set(ids)) < len(ids)
+
+def test_concurrent_allocations_never_collide(aws):
+    import lambda_function
+    
+    with atomic_requests(), simulated_latency(0.002), ThreadPoolExecutor(max_workers=16) as pool:
+        values = list(pool.map(lambda _: lambda_function.next_sequence_value('use_case_id'), range(400)))
+    
+    assert sorted(values) == list(range(1, 401))
+
+def test_concurrent_creates_get_distinct_ids(aws):
+    import lambda_function
+    
+    # Seeded use cases the counter doesn't know about yet are skipped, not overwritten
+    for use_case_id in (1, 2, 3):
+        lambda_function.use_cases_table.put_item(Item={'use_case_id': use_case_id, 'name': f'Seeded {use_case_id}'})
+    
+    with atomic_requests(), simulated_latency(0.002), ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: lambda_function.create_use_case(USE_CASE), range(40)))
+    
+    assert {result['statusCode'] for result in results} == {201}
+    ids = [json.loads(result['body'])['use_case']['use_case_id'] for result in results]
+    assert len(set(ids)) == 40
+    assert not set(ids) & {1, 2, 3}
+    assert lambda_function.use_cases_table.get_item(Key={'use_case_id': 1})['Item']['name'] == 'Seeded 1'
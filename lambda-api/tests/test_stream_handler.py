@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+import stream_handler
+
+def test_deserialize_wire_types():
+    image = {
+        'name': {'S': 'Vault 101'},
+        'use_case': {'N': '3'},
+        'ratio': {'N': '0.5'},
+        'active': {'BOOL': True},
+        'gone': {'NULL': True},
+        'members': {'L': [{'M': {'name': {'S': 'Amata'}, 'age': {'N': '19'}}}]},
+        'tags': {'SS': ['a', 'b']},
+        'lucky': {'NS': ['7', '13']}
+    }
+    assert stream_handler.deserialize_image(image) == {
+        'name': 'Vault 101', 'use_case': 3, 'ratio': 0.5, 'active': True, 'gone': None,
+        'members': [{'name': 'Amata', 'age': 19}], 'tags': {'a', 'b'}, 'lucky': {7, 13}
+    }
+
+def test_diff_catches_a_member_rename_and_ignores_updated_at():
+    old = {
+        'team_id': {'S': 'vault-101'},
+        'members': {'L': [{'M': {'name': {'S': 'Amata'}}}, {'M': {'name': {'S': 'Butch'}}}]},
+        'updated_at': {'S': '2026-02-06T18:37:24Z'}
+    }
+    new = {
+        'team_id': {'S': 'vault-101'},
+        'members': {'L': [{'M': {'name': {'S': 'Amata'}}}, {'M': {'name': {'S': 'Butch DeLoria'}}}]},
+        'updated_at': {'S': '2026-02-07T09:00:00Z'},
+        'catchphrase': {'S': 'War never changes'}
+    }
+    changes = sorted(stream_handler.diff_images(old, new))
+    assert [(change.field, change.kind) for change in changes] == [('catchphrase', 'added'), ('members', 'modified')]
+    assert changes[1].new == [{'name': 'Amata'}, {'name': 'Butch DeLoria'}]
+    
+    touched_only = dict(old, updated_at={'S': '2026-02-08T00:00:00Z'})
+    assert stream_handler.diff_images(old, touched_only) == []
+
+def team_record(event_id, sequence, event_name='INSERT', new=None, old=None, team_id='vault-101'):
+    """Stream record for a team; images are wire-format attribute maps"""
+    data = {'Keys': {'team_id': {'S': team_id}}, 'SequenceNumber': sequence,
+            'ApproximateCreationDateTime': int(time.time())}
+    data['NewImage'] = new or {'team_id': {'S': team_id}, 'team_name': {'S': 'Vault 101'}}
+    if old:
+        data['OldImage'] = old
+    return {'eventID': event_id, 'eventName': event_name, 'dynamodb': data}
+
+class FakePublisher:
+    """Stands in for send_notification, recording subjects; set fail to make every publish fail"""
+    
+    def __init__(self):
+        self.subjects = []
+        self.fail = False
+    
+    def __call__(self, subject, message):
+        if self.fail:
+            return False
+        self.subjects.append(subject)
+        return True
+
+@pytest.fixture
+def publisher(aws, monkeypatch):
+    fake = FakePublisher()
+    monkeypatch.setattr(stream_handler, 'send_notification', fake)
+    return fake
+
+def dedupe_status(event_id):
+    return stream_handler.dedupe_table.get_item(Key={'event_id': event_id}).get('Item', {}).get('status')
+
+def test_claimed_record_is_published_once(publisher):
+    batch = {'Records': [team_record('e1', '100')]}
+    
+    assert stream_handler.lambda_handler(batch, None) == {'batchItemFailures': []}
+    assert dedupe_status('e1') == 'sent'
+    
+    # A redelivered batch finds the sent marker and skips the record
+    assert stream_handler.lambda_handler(batch, None) == {'batchItemFailures': []}
+    assert len(publisher.subjects) == 1
+
+def test_failed_publish_is_reported_and_released(publisher):
+    publisher.fail = True
+    batch = {'Records': [team_record('e1', '100'), team_record('e2', '101', team_id='vault-111')]}
+    
+    result = stream_handler.lambda_handler(batch, None)
+    assert result == {'batchItemFailures': [{'itemIdentifier': '100'}, {'itemIdentifier': '101'}]}
+    assert dedupe_status('e1') is None
+    
+    publisher.fail = False
+    assert stream_handler.lambda_handler(batch, None) == {'batchItemFailures': []}
+    assert len(publisher.subjects) == 2
+
+def test_fresh_pending_claim_is_retried_not_dropped(publisher):
+    # An earlier invocation claimed e1 and crashed before publishing
+    now = int(time.time())
+    stream_handler.dedupe_table.put_item(Item={'event_id': 'e1', 'status': 'pending', 'claimed_at': now, 'expires_at': now + 60})
+    
+    assert stream_handler.claim_event(team_record('e1', '100')) == 'error'
+    result = stream_handler.lambda_handler({'Records': [team_record('e1', '100')]}, None)
+    assert result == {'batchItemFailures': [{'itemIdentifier': '100'}]}
+    assert publisher.subjects == []
+
+def test_stale_pending_claim_is_taken_over(publisher):
+    stale = int(time.time()) - stream_handler.CLAIM_TIMEOUT_SECONDS - 1
+    stream_handler.dedupe_table.put_item(Item={'event_id': 'e1', 'status': 'pending', 'claimed_at': stale, 'expires_at': stale + 60})
+    
+    assert stream_handler.lambda_handler({'Records': [team_record('e1', '100')]}, None) == {'batchItemFailures': []}
+    assert len(publisher.subjects) == 1
+    assert dedupe_status('e1') == 'sent'
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+SCORE = {'team_id': 't1', 'presentation': 5, 'innovation': 4, 'functionality': 3, 'aws_well_architected': 2}
+
+@pytest.fixture
+def conflicting(aws, monkeypatch):
+    """Make the first `conflicts` score transactions fail with TransactionConflict on the criteria item"""
+    import lambda_function
+    
+    lambda_function.judging_criteria_table.put_item(Item={'criteria_id': 'main', 'voting_locked': False})
+    lambda_function.teams_table.put_item(Item={'team_id': 't1'})
+    monkeypatch.setattr(lambda_function.time, 'sleep', lambda seconds: None)
+    
+    client = lambda_function.scores_table.meta.client
+    real_transact = client.transact_write_items
+    calls = []
+    def install(conflicts):
+        def transact_write_items(**kwargs):
+            calls.append(kwargs)
+            if len(calls) <= conflicts:
+                raise client.exceptions.TransactionCanceledException({
+                    'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled'},
+                    'CancellationReasons': [{'Code': 'TransactionConflict'}, {'Code': 'None'}, {'Code': 'None'}]
+                }, 'TransactWriteItems')
+            return real_transact(**kwargs)
+        monkeypatch.setattr(client, 'transact_write_items', transact_write_items)
+        return calls
+    return install
+
+def test_conflicting_submission_is_retried(conflicting):
+    import lambda_function
+    
+    calls = conflicting(2)
+    result = lambda_function.submit_score('p1', SCORE)
+    assert result['statusCode'] == 200
+    assert len(calls) == 3
+    assert lambda_function.scores_table.get_item(Key={'team_id': 't1', 'panelist_id': 'p1'})['Item']['total'] == 14
+
+def test_persistent_conflict_gives_up_with_503(conflicting):
+    import lambda_function
+    
+    calls = conflicting(lambda_function.TRANSACT_MAX_ATTEMPTS)
+    result = lambda_function.submit_score('p1', SCORE)
+    assert result['statusCode'] == 503
+    assert 'error' in json.loads(result['body'])
+    assert len(calls) == lambda_function.TRANSACT_MAX_ATTEMPTS
+    assert 'Item' not in lambda_function.scores_table.get_item(Key={'team_id': 't1', 'panelist_id': 'p1'})
+
+def test_locked_voting_is_not_retried(conflicting):
+    import lambda_function
+    
+    calls = conflicting(0)
+    lambda_function.judging_criteria_table.put_item(Item={'criteria_id': 'main', 'voting_locked': True})
+    assert lambda_function.submit_score('p1', SCORE)['statusCode'] == 403
+    assert len(calls) == 1
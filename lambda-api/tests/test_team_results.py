@@ -0,0 +1,36 @@
+import json
+
+def test_results_gate_ignores_the_warm_criteria_cache(aws):
+    import lambda_function
+    
+    lambda_function.judging_criteria_table.put_item(Item={'criteria_id': 'main', 'voting_locked': False})
+    assert lambda_function.load_criteria()['voting_locked'] is False  # Warm cache now says unlocked
+    
+    lambda_function.judging_criteria_table.put_item(Item={
+        'criteria_id': 'main', 'voting_locked': True, 'results_snapshot_id': 'snap-1'
+    })
+    lambda_function.results_table.put_item(Item={
+        'team_id': 't1', 'snapshot_id': 'snap-1', 'results': {'team_id': 't1', 'rank': 1}
+    })
+    result = lambda_function.get_team_results('t1')
+    assert result['statusCode'] == 200
+    
+    # Unlocking hides results straight away too
+    lambda_function.judging_criteria_table.put_item(Item={'criteria_id': 'main', 'voting_locked': False})
+    assert lambda_function.get_team_results('t1')['statusCode'] == 403
+
+def test_tied_teams_share_a_position_but_only_one_row_is_yours(aws):
+    import lambda_function
+    
+    lambda_function.judging_criteria_table.put_item(Item={'criteria_id': 'main', 'voting_locked': True})
+    for team_id, total in (('alpha', 14), ('bravo', 14), ('charlie', 10)):
+        lambda_function.teams_table.put_item(Item={'team_id': team_id, 'team_name': team_id.title()})
+        lambda_function.scores_table.put_item(Item={
+            'team_id': team_id, 'panelist_id': 'p1', 'presentation': 4, 'innovation': 4,
+            'functionality': 3, 'aws_well_architected': 3, 'total': total
+        })
+    
+    result = json.loads(lambda_function.get_team_results('bravo')['body'])
+    assert result['position'] == 1
+    assert [(row['position'], row['team_id']) for row in result['leaderboard']] == [(1, 'alpha'), (1, 'bravo'), (3, 'charlie')]
+    assert [row['team_name'] for row in result['leaderboard'] if row['team_id'] == result['team_id']] == ['Bravo']
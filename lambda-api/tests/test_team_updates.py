@@ -0,0 +1,98 @@
+import pytest
+
+import stream_handler
+from test_stream_handler import FakePublisher, team_record
+
+def team_image(use_case, catchphrase):
+    return {'team_id': {'S': 'vault-101'}, 'team_name': {'S': 'Vault 101'},
+            'use_case': {'N': str(use_case)}, 'catchphrase': {'S': catchphrase}}
+
+V0 = team_image(1, 'War never changes')
+V1 = team_image(2, 'War never changes')
+V2 = team_image(3, 'War never changes')
+
+@pytest.fixture
+def coalescing(aws, monkeypatch):
+    """Hold team updates for a 60s quiet period (15 minutes at most); returns the fake publisher"""
+    monkeypatch.setattr(stream_handler, 'TEAM_UPDATE_QUIET_SECONDS', 60)
+    monkeypatch.setattr(stream_handler, 'TEAM_UPDATE_MAX_DELAY_SECONDS', 900)
+    publisher = FakePublisher()
+    monkeypatch.setattr(stream_handler, 'send_notification', publisher)
+    return publisher
+
+def edit(event_id, sequence, old, new):
+    batch = {'Records': [team_record(event_id, sequence, 'MODIFY', new=new, old=old)]}
+    assert stream_handler.lambda_handler(batch, None) == {'batchItemFailures': []}
+
+def age_state(first_by, last_by):
+    """Move the pending state's change times into the past"""
+    state = stream_handler.notification_state_table.get_item(Key={'team_id': 'vault-101'})['Item']
+    stream_handler.notification_state_table.update_item(
+        Key={'team_id': 'vault-101'},
+        UpdateExpression='SET first_change_at = :first, last_change_at = :last',
+        ExpressionAttributeValues={':first': state['first_change_at'] - first_by, ':last': state['last_change_at'] - last_by}
+    )
+
+def flush():
+    """The scheduled invocation"""
+    assert stream_handler.lambda_handler({}, None) == {'statusCode': 200}
+
+def pending_state():
+    return stream_handler.notification_state_table.get_item(Key={'team_id': 'vault-101'}).get('Item')
+
+def test_edits_are_coalesced_until_the_quiet_period_passes(coalescing):
+    edit('e1', '100', V0, V1)
+    edit('e2', '101', V1, V2)
+    flush()
+    assert coalescing.subjects == []  # Still inside the quiet period
+    assert pending_state()['version'] == 2
+    
+    age_state(61, 61)
+    flush()
+    assert coalescing.subjects == ['📝 Team Update: Vault 101']
+    assert pending_state() is None
+
+def test_overdue_update_is_sent_while_the_team_keeps_editing(coalescing):
+    edit('e1', '100', V0, V1)
+    age_state(901, 0)  # Started 15 minutes ago, latest edit just now
+    flush()
+    assert len(coalescing.subjects) == 1
+
+def test_edits_that_cancel_out_send_nothing(coalescing):
+    edit('e1', '100', V0, V1)
+    edit('e2', '101', V1, V0)
+    age_state(61, 61)
+    flush()
+    assert coalescing.subjects == []
+    assert pending_state() is None
+
+def test_edit_racing_a_flush_is_kept(coalescing, monkeypatch):
+    edit('e1', '100', V0, V1)
+    age_state(901, 0)
+    
+    # Another edit is buffered, within the same second, after the flush read the state
+    real_scan = stream_handler.notification_state_table.scan
+    def scan_then_edit(**kwargs):
+        result = real_scan(**kwargs)
+        assert stream_handler.buffer_team_update([team_record('e2', '101', 'MODIFY', new=V2, old=V1)])
+        return result
+    with monkeypatch.context() as patched:
+        patched.setattr(stream_handler.notification_state_table, 'scan', scan_then_edit)
+        assert stream_handler.collect_team_updates() == []
+    
+    state = pending_state()
+    assert state['version'] == 2
+    assert '"3"' in state['latest']  # The newer edit is still pending, not deleted unsent
+
+def test_failed_flush_is_restored(coalescing):
+    edit('e1', '100', V0, V1)
+    age_state(61, 61)
+    coalescing.fail = True
+    flush()
+    assert coalescing.subjects == []
+    
+    state = pending_state()
+    assert state['version'] == 1
+    coalescing.fail = False
+    flush()
+    assert len(coalescing.subjects) == 1